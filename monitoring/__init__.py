@@ -3,6 +3,7 @@ from .models import (
     ConnectDeviceRequest,
     CreateSpectrometerRequest,
     CreateVacuumChamberRequest,
+    DeviceCapabilities,
     DeviceInfo,
     DeviceStatus,
     DeviceType,
@@ -24,6 +25,7 @@ __all__ = [
     "ConnectDeviceRequest",
     "CreateSpectrometerRequest",
     "CreateVacuumChamberRequest",
+    "DeviceCapabilities",
     "DeviceInfo",
     "DeviceStatus",
     "DeviceType",
@@ -1,8 +1,10 @@
 from __future__ import annotations
 
-from fastapi import HTTPException
+import httpx
+from fastapi import Depends, HTTPException
 
 from .device_registry import DeviceRegistry
+from .models import DeviceInfo, SpectrometerConfig, VacuumChamberConfig
 
 _registry: DeviceRegistry | None = None
 
@@ -16,3 +18,39 @@ def get_registry() -> DeviceRegistry:
     if _registry is None:
         raise HTTPException(status_code=500, detail="Device registry not initialized")
     return _registry
+
+
+def get_device_client(registry: DeviceRegistry = Depends(get_registry)) -> httpx.AsyncClient:
+    return registry.client
+
+
+def resolve_spectrometer(spectrometer_id: str, registry: DeviceRegistry = Depends(get_registry)) -> SpectrometerConfig:
+    config = registry.get_spectrometer(spectrometer_id)
+    if not config:
+        raise HTTPException(status_code=404, detail=f"Spectrometer {spectrometer_id} not found")
+    return config
+
+
+def resolve_spectrometer_device(
+    config: SpectrometerConfig = Depends(resolve_spectrometer), registry: DeviceRegistry = Depends(get_registry)
+) -> DeviceInfo:
+    device = registry.get_device(config.device_id)
+    if not device:
+        raise HTTPException(status_code=404, detail=f"Device {config.device_id} not found")
+    return device
+
+
+def resolve_vacuum_chamber(chamber_id: str, registry: DeviceRegistry = Depends(get_registry)) -> VacuumChamberConfig:
+    config = registry.get_vacuum_chamber(chamber_id)
+    if not config:
+        raise HTTPException(status_code=404, detail=f"Vacuum chamber {chamber_id} not found")
+    return config
+
+
+def resolve_vacuum_chamber_device(
+    config: VacuumChamberConfig = Depends(resolve_vacuum_chamber), registry: DeviceRegistry = Depends(get_registry)
+) -> DeviceInfo:
+    device = registry.get_device(config.device_id)
+    if not device:
+        raise HTTPException(status_code=404, detail=f"Device {config.device_id} not found")
+    return device
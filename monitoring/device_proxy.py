@@ -0,0 +1,69 @@
+from __future__ import annotations
+
+import asyncio
+import logging
+from functools import lru_cache
+from typing import Any
+
+import httpx
+
+from .models import DeviceInfo
+
+logger = logging.getLogger(__name__)
+
+# Delays before each retry; a request is attempted at most len(RETRY_BACKOFF) + 1 times.
+RETRY_BACKOFF = (0.05, 0.2)
+
+
+class DeviceForwardError(Exception):
+    """Raised when a command could not be delivered to a device."""
+
+    def __init__(self, status_code: int, detail: str):
+        super().__init__(detail)
+        self.status_code = status_code
+        self.detail = detail
+
+
+@lru_cache(maxsize=256)
+def _device_url(address: str, port: int, path: str) -> httpx.URL:
+    # A parsed URL skips httpx's string parsing on every request to the same endpoint
+    return httpx.URL(f"http://{address}:{port}{path}")
+
+
+async def forward_to_device(
+    client: httpx.AsyncClient,
+    device: DeviceInfo,
+    path: str,
+    json: Any = None,
+    *,
+    timeout: float = 5.0,
+    retries: int = len(RETRY_BACKOFF),
+) -> httpx.Response:
+    """POST to a device endpoint, retrying timeouts and 5xx responses with backoff.
+
+    Raises DeviceForwardError with 504 on timeout and 502 on any other failure.
+    """
+    url = _device_url(device.address, device.port, path)
+    for attempt in range(retries + 1):
+        retrying = attempt < retries
+        try:
+            response = await client.post(url, json=json, timeout=timeout)
+        except httpx.TimeoutException:
+            if not retrying:
+                logger.error("Timeout communicating with device at %s", url)
+                raise DeviceForwardError(504, "Timeout communicating with device")
+        except httpx.RequestError as e:
+            logger.error("Error communicating with device at %s: %s", url, e)
+            raise DeviceForwardError(502, f"Failed to communicate with device: {e}")
+        else:
+            if response.is_success:
+                return response
+            if response.status_code < 500 or not retrying:
+                logger.warning("Device at %s returned error: %s", url, response.status_code)
+                raise DeviceForwardError(502, f"Device returned error: {response.status_code}")
+
+        delay = RETRY_BACKOFF[min(attempt, len(RETRY_BACKOFF) - 1)]
+        logger.debug("Retrying %s in %.2fs (attempt %d/%d)", url, delay, attempt + 2, retries + 1)
+        await asyncio.sleep(delay)
+
+    raise AssertionError("unreachable")
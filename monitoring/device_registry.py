@@ -1,144 +1,310 @@
 from __future__ import annotations
 
+import asyncio
+import hashlib
 import logging
+from collections.abc import Callable
+from dataclasses import dataclass
 from datetime import datetime
 
 import httpx
+import numpy as np
+import orjson
+from pydantic import ValidationError
 
+from . import models
 from .models import (
+    ActiveMonitoringStatus,
+    DeviceCapabilities,
     DeviceInfo,
     DeviceStatus,
     DeviceType,
     ProcessType,
     SpectralData,
     SpectrometerConfig,
+    SpectrometerDetails,
     VacuumChamberConfig,
+    VacuumChamberDetails,
     VacuumChamberStatus,
 )
 
 logger = logging.getLogger(__name__)
 
+_DISCOVERY_FAILURE: tuple[None, None, None] = (None, None, None)
+
+
+@dataclass(slots=True, frozen=True)
+class SpectralArray:
+    """Latest spectrum for a spectrometer, held as packed float arrays."""
+
+    timestamp: datetime
+    readings: np.ndarray
+    wavelengths: np.ndarray
+
+    def to_model(self) -> SpectralData:
+        return SpectralData.model_construct(
+            timestamp=self.timestamp,
+            calibrated_readings=self.readings.tolist(),
+            wavelengths=self.wavelengths.tolist(),
+        )
+
+    def to_json(self) -> bytes:
+        """Serialize as a SpectralData JSON document without building the model."""
+        # Widened like tolist() in to_model, so float32 spectra print the same digits on every endpoint
+        return orjson.dumps(
+            {
+                "timestamp": self.timestamp,
+                "calibrated_readings": self.readings.astype(np.float64, copy=False),
+                "wavelengths": self.wavelengths.astype(np.float64, copy=False),
+            },
+            option=orjson.OPT_SERIALIZE_NUMPY | orjson.OPT_UTC_Z,
+        )
+
+
+def _as_spectrum(values: list[float] | np.ndarray) -> np.ndarray:
+    # Float arrays (e.g. float32 binary frames) are kept as-is; JSON lists become float64.
+    if isinstance(values, np.ndarray) and values.dtype.kind == "f":
+        return values
+    return np.asarray(values, dtype=np.float64)
+
+
+def _reindex_after_removal(
+    index: dict[str, str],
+    components: dict[str, SpectrometerConfig] | dict[str, VacuumChamberConfig],
+    device_id: str,
+    removed_id: str,
+) -> None:
+    # The index holds one component per device; if that one was removed, point it at another
+    # component still attached to the device (if any) instead of dropping the device entirely.
+    if index.get(device_id) != removed_id:
+        return
+    replacement = next((c.id for c in components.values() if c.device_id == device_id), None)
+    if replacement is None:
+        del index[device_id]
+    else:
+        index[device_id] = replacement
+
+
+def _build_spectrometer_config(
+    device_info: DeviceInfo, capabilities: DeviceCapabilities, created_at: datetime
+) -> SpectrometerConfig:
+    return SpectrometerConfig(
+        device_id=device_info.id,
+        name=f"{device_info.name} - Spectrometer",
+        is_monochromatic=capabilities.is_monochromatic,
+        control_wavelength=None,
+        is_active=False,
+        created_at=created_at,
+    )
+
+
+def _build_vacuum_chamber_config(
+    device_info: DeviceInfo, capabilities: DeviceCapabilities, created_at: datetime
+) -> VacuumChamberConfig:
+    return VacuumChamberConfig(
+        device_id=device_info.id,
+        name=f"{device_info.name} - Vacuum Chamber",
+        process_type=capabilities.process_type or ProcessType.TWO_COMPONENT,
+        current_material="H",
+        current_fraction=None,
+        status=VacuumChamberStatus.STOPPED,
+        is_active=False,
+        created_at=created_at,
+    )
+
 
 class DeviceRegistry:
     def __init__(self):
         self.devices: dict[str, DeviceInfo] = {}
         self.spectrometers: dict[str, SpectrometerConfig] = {}
         self.vacuum_chambers: dict[str, VacuumChamberConfig] = {}
-        self.spectral_data: dict[str, SpectralData] = {}
+        self.spectral_data: dict[str, SpectralArray] = {}
+        self._spectral_json: dict[str, tuple[bytes, str]] = {}
+        self._devices_by_endpoint: dict[tuple[str, int], str] = {}
+        self._spec_by_device: dict[str, str] = {}
+        self._chamber_by_device: dict[str, str] = {}
+        self._devices_snapshot: tuple[DeviceInfo, ...] | None = None
+        self._spectrometers_snapshot: tuple[SpectrometerConfig, ...] | None = None
+        self._vacuum_chambers_snapshot: tuple[VacuumChamberConfig, ...] | None = None
+        self._active_status_cache: ActiveMonitoringStatus | None = None
+        self._active_spectrometer_id: str | None = None
+        self._active_vacuum_chamber_id: str | None = None
+        self._client: httpx.AsyncClient | None = None
+        self._inflight: dict[tuple[str, int], asyncio.Task] = {}
         logger.info("Device registry initialized")
 
+    @property
+    def client(self) -> httpx.AsyncClient:
+        """Pooled HTTP client shared by all device calls, opened on first use."""
+        if self._client is None:
+            self._client = httpx.AsyncClient(
+                timeout=5.0,
+                limits=httpx.Limits(max_keepalive_connections=20, max_connections=100),
+            )
+        return self._client
+
+    async def startup(self) -> None:
+        """Open the pooled HTTP client ahead of the first device call."""
+        _ = self.client
+
+    async def aclose(self) -> None:
+        """Close the pooled HTTP client."""
+        if self._client is not None:
+            await self._client.aclose()
+            self._client = None
+
     async def discover_device(
         self, port: int, address: str, monitoring_api_url: str
     ) -> tuple[DeviceInfo | None, str | None, str | None]:
+        # Concurrent connects to the same endpoint share one discovery instead of
+        # creating duplicate devices; shield it so a cancelled caller doesn't abort it.
+        key = (address, port)
+        task = self._inflight.get(key)
+        if task is None:
+            task = asyncio.ensure_future(self._discover_device(port, address, monitoring_api_url))
+            self._inflight[key] = task
+            task.add_done_callback(lambda _: self._inflight.pop(key, None))
+        return await asyncio.shield(task)
+
+    async def _discover_device(
+        self, port: int, address: str, monitoring_api_url: str
+    ) -> tuple[DeviceInfo | None, str | None, str | None]:
+        existing_id = self._devices_by_endpoint.get((address, port))
+        if existing_id is not None:
+            existing = self.devices.get(existing_id)
+            if existing is not None and existing.status == DeviceStatus.CONNECTED:
+                spectrometer = self.get_spectrometer_by_device(existing_id)
+                vacuum_chamber = self.get_vacuum_chamber_by_device(existing_id)
+                spectrometer_id = spectrometer.id if spectrometer is not None else None
+                vacuum_chamber_id = vacuum_chamber.id if vacuum_chamber is not None else None
+                logger.info("Device at %s:%s already connected (id=%s)", address, port, existing_id)
+                # Skip /device/info but re-send /register: the device may have restarted and lost its ids
+                await self._register_device(address, port, monitoring_api_url, spectrometer_id, vacuum_chamber_id)
+                return (existing, spectrometer_id, vacuum_chamber_id)
+
         url = f"http://{address}:{port}/device/info"
-        logger.info(f"Attempting to discover device at {url}")
+        logger.info("Attempting to discover device at %s", url)
+        client = self.client
         try:
-            async with httpx.AsyncClient() as client:
-                response = await client.get(url, timeout=5.0)
-                if response.status_code == 200:
-                    data = response.json()
-                    device_info = DeviceInfo(
-                        type=DeviceType(data["type"]),
-                        port=port,
-                        address=address,
-                        name=data.get("name", "Unknown Device"),
-                        status=DeviceStatus.CONNECTED,
-                        capabilities=data.get("capabilities", {}),
-                    )
-                    self.devices[device_info.id] = device_info
-                    logger.info(
-                        f"Discovered device: {device_info.name} (type={device_info.type.value}, id={device_info.id})"
-                    )
-
-                    spectrometer_id = None
-                    vacuum_chamber_id = None
-
-                    capabilities = device_info.capabilities
-                    if capabilities.get("has_spectrometer"):
-                        is_monochromatic = capabilities.get("is_monochromatic", False)
-
-                        spectrometer_config = SpectrometerConfig(
-                            device_id=device_info.id,
-                            name=f"{device_info.name} - Spectrometer",
-                            is_monochromatic=is_monochromatic,
-                            control_wavelength=None,
-                            is_active=False,
-                        )
-                        self.add_spectrometer(spectrometer_config)
-                        spectrometer_id = spectrometer_config.id
-                        logger.info(f"Auto-created spectrometer: {spectrometer_config.name} (id={spectrometer_id})")
-
-                    if capabilities.get("has_vacuum_chamber"):
-                        process_type = ProcessType(capabilities.get("process_type", "two-component"))
-
-                        vacuum_chamber_config = VacuumChamberConfig(
-                            device_id=device_info.id,
-                            name=f"{device_info.name} - Vacuum Chamber",
-                            process_type=process_type,
-                            current_material="H",
-                            current_fraction=None,
-                            status=VacuumChamberStatus.STOPPED,
-                            is_active=False,
-                        )
-                        self.add_vacuum_chamber(vacuum_chamber_config)
-                        vacuum_chamber_id = vacuum_chamber_config.id
-                        logger.info(
-                            f"Auto-created vacuum chamber: {vacuum_chamber_config.name} (id={vacuum_chamber_id}, type={process_type.value})"
-                        )
-
-                    register_url = f"http://{address}:{port}/register"
-                    register_payload = {
-                        "monitoring_api_url": monitoring_api_url,
-                        "spectrometer_id": spectrometer_id,
-                        "vacuum_chamber_id": vacuum_chamber_id,
-                    }
-                    try:
-                        register_response = await client.post(register_url, json=register_payload, timeout=5.0)
-                        if register_response.status_code == 200:
-                            logger.info(
-                                f"Device registered successfully - spectrometer_id={spectrometer_id}, vacuum_chamber_id={vacuum_chamber_id}"
-                            )
-                        else:
-                            logger.warning(f"Device registration returned status {register_response.status_code}")
-                    except Exception as reg_error:
-                        logger.warning(f"Failed to register device (non-fatal): {reg_error}")
-
-                    return (device_info, spectrometer_id, vacuum_chamber_id)
-                else:
-                    logger.warning(f"Device at {url} returned status code {response.status_code}")
-                return (None, None, None)
+            response = await client.get(url, timeout=5.0)
+            if response.status_code == 200:
+                data = response.json()
+                raw_capabilities = data.get("capabilities", {})
+                if not raw_capabilities.get("has_vacuum_chamber"):
+                    # process_type only describes a vacuum chamber; an unknown value must not fail other devices
+                    raw_capabilities = {key: value for key, value in raw_capabilities.items() if key != "process_type"}
+                device_info = DeviceInfo(
+                    type=DeviceType(data["type"]),
+                    port=port,
+                    address=address,
+                    name=data.get("name", "Unknown Device"),
+                    status=DeviceStatus.CONNECTED,
+                    capabilities=DeviceCapabilities(**raw_capabilities),
+                )
+                self.devices[device_info.id] = device_info
+                self._devices_snapshot = None
+                self._active_status_cache = None
+                self._devices_by_endpoint[(address, port)] = device_info.id
+                logger.info(
+                    "Discovered device: %s (type=%s, id=%s)", device_info.name, device_info.type.value, device_info.id
+                )
+
+                capabilities = device_info.capabilities
+                created_at = models._now()
+                created = [
+                    (label, factory(device_info, capabilities, created_at), register)
+                    for capability, label, factory, register in _CAPABILITY_HANDLERS
+                    if getattr(capabilities, capability)
+                ]
+                ids = {label: config.id for label, config, _ in created}
+                spectrometer_id = ids.get("spectrometer")
+                vacuum_chamber_id = ids.get("vacuum chamber")
+
+                for label, config, register in created:
+                    register(self, config)
+                    logger.info("Auto-created %s: %s (id=%s)", label, config.name, config.id)
+
+                await self._register_device(address, port, monitoring_api_url, spectrometer_id, vacuum_chamber_id)
+                return (device_info, spectrometer_id, vacuum_chamber_id)
+            else:
+                logger.warning("Device at %s returned status code %s", url, response.status_code)
+            return _DISCOVERY_FAILURE
         except httpx.TimeoutException:
-            logger.error(f"Timeout connecting to device at {url}")
-            return (None, None, None)
+            logger.error("Timeout connecting to device at %s", url)
+            return _DISCOVERY_FAILURE
+        except ValidationError as e:
+            logger.error("Device at %s reported invalid device info: %s", url, e)
+            return _DISCOVERY_FAILURE
         except Exception as e:
-            logger.error(f"Error discovering device at {url}: {e}")
-            return (None, None, None)
+            logger.error("Error discovering device at %s: %s", url, e)
+            return _DISCOVERY_FAILURE
+
+    async def _register_device(
+        self,
+        address: str,
+        port: int,
+        monitoring_api_url: str,
+        spectrometer_id: str | None,
+        vacuum_chamber_id: str | None,
+    ) -> None:
+        """Tell the device where to post data and which component ids to use; failures are non-fatal."""
+        register_url = f"http://{address}:{port}/register"
+        register_payload = {
+            "monitoring_api_url": monitoring_api_url,
+            "spectrometer_id": spectrometer_id,
+            "vacuum_chamber_id": vacuum_chamber_id,
+        }
+        try:
+            register_response = await self.client.post(register_url, json=register_payload, timeout=5.0)
+            if register_response.status_code == 200:
+                logger.info(
+                    "Device registered successfully - spectrometer_id=%s, vacuum_chamber_id=%s",
+                    spectrometer_id,
+                    vacuum_chamber_id,
+                )
+            else:
+                logger.warning("Device registration returned status %s", register_response.status_code)
+        except Exception as reg_error:
+            logger.warning("Failed to register device (non-fatal): %s", reg_error)
 
     def get_device(self, device_id: str) -> DeviceInfo | None:
         return self.devices.get(device_id)
 
-    def list_devices(self) -> list[DeviceInfo]:
-        return list(self.devices.values())
+    def list_devices(self) -> tuple[DeviceInfo, ...]:
+        if self._devices_snapshot is None:
+            self._devices_snapshot = tuple(self.devices.values())
+        return self._devices_snapshot
 
     def remove_device(self, device_id: str) -> bool:
-        if device_id in self.devices:
-            device = self.devices[device_id]
-            del self.devices[device_id]
-            logger.info(f"Removed device: {device.name} (id={device_id})")
+        device = self.devices.pop(device_id, None)
+        if device is not None:
+            self._devices_snapshot = None
+            self._active_status_cache = None
+            if self._devices_by_endpoint.get((device.address, device.port)) == device_id:
+                del self._devices_by_endpoint[(device.address, device.port)]
+            logger.info("Removed device: %s (id=%s)", device.name, device_id)
             return True
-        logger.warning(f"Attempted to remove non-existent device: {device_id}")
+        logger.warning("Attempted to remove non-existent device: %s", device_id)
         return False
 
     def add_spectrometer(self, config: SpectrometerConfig) -> SpectrometerConfig:
         self.spectrometers[config.id] = config
-        logger.info(f"Added spectrometer: {config.name} (id={config.id})")
+        self._spectrometers_snapshot = None
+        self._spec_by_device.setdefault(config.device_id, config.id)
+        logger.info("Added spectrometer: %s (id=%s)", config.name, config.id)
         return config
 
     def get_spectrometer(self, spectrometer_id: str) -> SpectrometerConfig | None:
         return self.spectrometers.get(spectrometer_id)
 
-    def list_spectrometers(self) -> list[SpectrometerConfig]:
-        return list(self.spectrometers.values())
+    def get_spectrometer_by_device(self, device_id: str) -> SpectrometerConfig | None:
+        spectrometer_id = self._spec_by_device.get(device_id)
+        return self.spectrometers.get(spectrometer_id) if spectrometer_id else None
+
+    def list_spectrometers(self) -> tuple[SpectrometerConfig, ...]:
+        if self._spectrometers_snapshot is None:
+            self._spectrometers_snapshot = tuple(self.spectrometers.values())
+        return self._spectrometers_snapshot
 
     def update_spectrometer(self, spectrometer_id: str, **kwargs) -> SpectrometerConfig | None:
         if spectrometer_id in self.spectrometers:
@@ -146,60 +312,146 @@ class DeviceRegistry:
             for key, value in kwargs.items():
                 if hasattr(config, key):
                     setattr(config, key, value)
-            logger.debug(f"Updated spectrometer {spectrometer_id}: {kwargs}")
+            self._active_status_cache = None
+            logger.debug("Updated spectrometer %s: %s", spectrometer_id, kwargs)
             return config
-        logger.warning(f"Attempted to update non-existent spectrometer: {spectrometer_id}")
+        logger.warning("Attempted to update non-existent spectrometer: %s", spectrometer_id)
         return None
 
-    def set_active_spectrometer(self, spectrometer_id: str) -> bool:
-        if spectrometer_id in self.spectrometers:
-            for spec_id, spec in self.spectrometers.items():
-                spec.is_active = spec_id == spectrometer_id
-            logger.info(f"Set active spectrometer: {self.spectrometers[spectrometer_id].name} (id={spectrometer_id})")
-            return True
-        logger.warning(f"Attempted to activate non-existent spectrometer: {spectrometer_id}")
-        return False
+    def set_active_spectrometer(self, spectrometer_id: str) -> SpectrometerConfig | None:
+        spec = self.spectrometers.get(spectrometer_id)
+        if spec is not None:
+            previous = self.get_active_spectrometer()
+            if previous is not None:
+                previous.is_active = False
+            spec.is_active = True
+            self._active_spectrometer_id = spectrometer_id
+            self._active_status_cache = None
+            logger.info("Set active spectrometer: %s (id=%s)", spec.name, spectrometer_id)
+            return spec
+        logger.warning("Attempted to activate non-existent spectrometer: %s", spectrometer_id)
+        return None
 
     def get_active_spectrometer(self) -> SpectrometerConfig | None:
-        for spec in self.spectrometers.values():
-            if spec.is_active:
-                return spec
-        return None
+        if self._active_spectrometer_id is None:
+            return None
+        return self.spectrometers.get(self._active_spectrometer_id)
 
     def remove_spectrometer(self, spectrometer_id: str) -> bool:
-        if spectrometer_id in self.spectrometers:
-            spec = self.spectrometers[spectrometer_id]
-            del self.spectrometers[spectrometer_id]
-            if spectrometer_id in self.spectral_data:
-                del self.spectral_data[spectrometer_id]
-            logger.info(f"Removed spectrometer: {spec.name} (id={spectrometer_id})")
+        spec = self.spectrometers.pop(spectrometer_id, None)
+        if spec is not None:
+            self._spectrometers_snapshot = None
+            if self._active_spectrometer_id == spectrometer_id:
+                self._active_spectrometer_id = None
+                self._active_status_cache = None
+            _reindex_after_removal(self._spec_by_device, self.spectrometers, spec.device_id, spectrometer_id)
+            self.spectral_data.pop(spectrometer_id, None)
+            self._spectral_json.pop(spectrometer_id, None)
+            logger.info("Removed spectrometer: %s (id=%s)", spec.name, spectrometer_id)
             return True
-        logger.warning(f"Attempted to remove non-existent spectrometer: {spectrometer_id}")
+        logger.warning("Attempted to remove non-existent spectrometer: %s", spectrometer_id)
         return False
 
     def store_spectral_data(
-        self, spectrometer_id: str, calibrated_readings: list[float], wavelengths: list[float], timestamp: datetime
-    ):
-        self.spectral_data[spectrometer_id] = SpectralData(
+        self,
+        spectrometer_id: str,
+        calibrated_readings: list[float] | np.ndarray,
+        wavelengths: list[float] | np.ndarray,
+        timestamp: datetime,
+    ) -> SpectralArray:
+        stored = SpectralArray(
             timestamp=timestamp,
-            calibrated_readings=calibrated_readings,
-            wavelengths=wavelengths,
+            readings=_as_spectrum(calibrated_readings),
+            wavelengths=_as_spectrum(wavelengths),
         )
-        logger.debug(f"Stored spectral data for spectrometer {spectrometer_id}: {len(calibrated_readings)} points")
+        self.spectral_data[spectrometer_id] = stored
+        self._spectral_json.pop(spectrometer_id, None)
+        if spectrometer_id == self._active_spectrometer_id:
+            self._active_status_cache = None
+        logger.debug("Stored spectral data for spectrometer %s: %d points", spectrometer_id, len(calibrated_readings))
+        return stored
 
     def get_spectral_data(self, spectrometer_id: str) -> SpectralData | None:
+        stored = self.spectral_data.get(spectrometer_id)
+        return stored.to_model() if stored is not None else None
+
+    def get_spectral_array(self, spectrometer_id: str) -> SpectralArray | None:
         return self.spectral_data.get(spectrometer_id)
 
+    def get_spectral_json(self, spectrometer_id: str) -> tuple[bytes, str] | None:
+        """Latest spectrum as (JSON bytes, ETag), serialized once per stored spectrum."""
+        cached = self._spectral_json.get(spectrometer_id)
+        if cached is None:
+            stored = self.spectral_data.get(spectrometer_id)
+            if stored is None:
+                return None
+            payload = stored.to_json()
+            etag = f'"{hashlib.blake2b(payload, digest_size=8).hexdigest()}"'
+            cached = self._spectral_json[spectrometer_id] = (payload, etag)
+        return cached
+
+    def get_active_monitoring_status(self) -> ActiveMonitoringStatus:
+        if self._active_status_cache is not None:
+            return self._active_status_cache
+
+        active_spec = self.get_active_spectrometer()
+        active_chamber = self.get_active_vacuum_chamber()
+
+        spec_details = None
+        if active_spec:
+            device = self.get_device(active_spec.device_id)
+            if device:
+                spec_details = SpectrometerDetails.model_construct(
+                    id=active_spec.id,
+                    device_id=active_spec.device_id,
+                    name=active_spec.name,
+                    is_monochromatic=active_spec.is_monochromatic,
+                    control_wavelength=active_spec.control_wavelength,
+                    is_active=active_spec.is_active,
+                    latest_data=self.get_spectral_data(active_spec.id),
+                    device_info=device,
+                )
+
+        chamber_details = None
+        if active_chamber:
+            device = self.get_device(active_chamber.device_id)
+            if device:
+                chamber_details = VacuumChamberDetails.model_construct(
+                    id=active_chamber.id,
+                    device_id=active_chamber.device_id,
+                    name=active_chamber.name,
+                    process_type=active_chamber.process_type,
+                    status=active_chamber.status,
+                    material=active_chamber.current_material,
+                    fraction=active_chamber.current_fraction,
+                    is_active=active_chamber.is_active,
+                    device_info=device,
+                )
+
+        self._active_status_cache = ActiveMonitoringStatus.model_construct(
+            spectrometer=spec_details,
+            vacuum_chamber=chamber_details,
+        )
+        return self._active_status_cache
+
     def add_vacuum_chamber(self, config: VacuumChamberConfig) -> VacuumChamberConfig:
         self.vacuum_chambers[config.id] = config
-        logger.info(f"Added vacuum chamber: {config.name} (id={config.id})")
+        self._vacuum_chambers_snapshot = None
+        self._chamber_by_device.setdefault(config.device_id, config.id)
+        logger.info("Added vacuum chamber: %s (id=%s)", config.name, config.id)
         return config
 
     def get_vacuum_chamber(self, chamber_id: str) -> VacuumChamberConfig | None:
         return self.vacuum_chambers.get(chamber_id)
 
-    def list_vacuum_chambers(self) -> list[VacuumChamberConfig]:
-        return list(self.vacuum_chambers.values())
+    def get_vacuum_chamber_by_device(self, device_id: str) -> VacuumChamberConfig | None:
+        chamber_id = self._chamber_by_device.get(device_id)
+        return self.vacuum_chambers.get(chamber_id) if chamber_id else None
+
+    def list_vacuum_chambers(self) -> tuple[VacuumChamberConfig, ...]:
+        if self._vacuum_chambers_snapshot is None:
+            self._vacuum_chambers_snapshot = tuple(self.vacuum_chambers.values())
+        return self._vacuum_chambers_snapshot
 
     def update_vacuum_chamber(self, chamber_id: str, **kwargs) -> VacuumChamberConfig | None:
         if chamber_id in self.vacuum_chambers:
@@ -207,31 +459,47 @@ class DeviceRegistry:
             for key, value in kwargs.items():
                 if hasattr(config, key):
                     setattr(config, key, value)
-            logger.debug(f"Updated vacuum chamber {chamber_id}: {kwargs}")
+            self._active_status_cache = None
+            logger.debug("Updated vacuum chamber %s: %s", chamber_id, kwargs)
             return config
-        logger.warning(f"Attempted to update non-existent vacuum chamber: {chamber_id}")
+        logger.warning("Attempted to update non-existent vacuum chamber: %s", chamber_id)
         return None
 
-    def set_active_vacuum_chamber(self, chamber_id: str) -> bool:
-        if chamber_id in self.vacuum_chambers:
-            for ch_id, chamber in self.vacuum_chambers.items():
-                chamber.is_active = ch_id == chamber_id
-            logger.info(f"Set active vacuum chamber: {self.vacuum_chambers[chamber_id].name} (id={chamber_id})")
-            return True
-        logger.warning(f"Attempted to activate non-existent vacuum chamber: {chamber_id}")
-        return False
+    def set_active_vacuum_chamber(self, chamber_id: str) -> VacuumChamberConfig | None:
+        chamber = self.vacuum_chambers.get(chamber_id)
+        if chamber is not None:
+            previous = self.get_active_vacuum_chamber()
+            if previous is not None:
+                previous.is_active = False
+            chamber.is_active = True
+            self._active_vacuum_chamber_id = chamber_id
+            self._active_status_cache = None
+            logger.info("Set active vacuum chamber: %s (id=%s)", chamber.name, chamber_id)
+            return chamber
+        logger.warning("Attempted to activate non-existent vacuum chamber: %s", chamber_id)
+        return None
 
     def get_active_vacuum_chamber(self) -> VacuumChamberConfig | None:
-        for chamber in self.vacuum_chambers.values():
-            if chamber.is_active:
-                return chamber
-        return None
+        if self._active_vacuum_chamber_id is None:
+            return None
+        return self.vacuum_chambers.get(self._active_vacuum_chamber_id)
 
     def remove_vacuum_chamber(self, chamber_id: str) -> bool:
-        if chamber_id in self.vacuum_chambers:
-            chamber = self.vacuum_chambers[chamber_id]
-            del self.vacuum_chambers[chamber_id]
-            logger.info(f"Removed vacuum chamber: {chamber.name} (id={chamber_id})")
+        chamber = self.vacuum_chambers.pop(chamber_id, None)
+        if chamber is not None:
+            self._vacuum_chambers_snapshot = None
+            if self._active_vacuum_chamber_id == chamber_id:
+                self._active_vacuum_chamber_id = None
+                self._active_status_cache = None
+            _reindex_after_removal(self._chamber_by_device, self.vacuum_chambers, chamber.device_id, chamber_id)
+            logger.info("Removed vacuum chamber: %s (id=%s)", chamber.name, chamber_id)
             return True
-        logger.warning(f"Attempted to remove non-existent vacuum chamber: {chamber_id}")
+        logger.warning("Attempted to remove non-existent vacuum chamber: %s", chamber_id)
         return False
+
+
+# Capability flag -> (label, config factory, registry method) for components auto-created on discovery
+_CAPABILITY_HANDLERS: tuple[tuple[str, str, Callable, Callable], ...] = (
+    ("has_spectrometer", "spectrometer", _build_spectrometer_config, DeviceRegistry.add_spectrometer),
+    ("has_vacuum_chamber", "vacuum chamber", _build_vacuum_chamber_config, DeviceRegistry.add_vacuum_chamber),
+)
@@ -3,14 +3,16 @@
 from __future__ import annotations
 
 import argparse
-import json
+from functools import lru_cache
 from pathlib import Path
 
+import orjson
 from fastapi.openapi.utils import get_openapi
 
 
-def dump(schema_path: str | Path = "docs/monitoring/openapi.json") -> None:
-    """Generate and save OpenAPI schema from the monitoring server app."""
+@lru_cache(maxsize=1)
+def _schema_json() -> bytes:
+    """Build the monitoring app once per process and serialize its schema."""
     from .server import create_app
 
     app = create_app()
@@ -21,10 +23,16 @@ def dump(schema_path: str | Path = "docs/monitoring/openapi.json") -> None:
         description=app.description,
         routes=app.routes,
     )
+    return orjson.dumps(schema, option=orjson.OPT_INDENT_2)
+
+
+def dump(schema_path: str | Path = "docs/monitoring/openapi.json") -> None:
+    """Generate and save OpenAPI schema from the monitoring server app."""
+    payload = _schema_json()
 
     output_path = Path(schema_path)
     output_path.parent.mkdir(parents=True, exist_ok=True)
-    output_path.write_text(json.dumps(schema, indent=2))
+    output_path.write_bytes(payload)
     print(f"OpenAPI schema written to {output_path}")
 
 
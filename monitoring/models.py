@@ -1,11 +1,21 @@
 from __future__ import annotations
 
+import struct
 from datetime import datetime
 from enum import Enum
 from uuid import uuid4
 
+import numpy as np
 from pydantic import BaseModel, ConfigDict, Field
 
+# Binary spectral frame header: uint64 timestamp (microseconds since the Unix epoch), uint32 point count
+SPECTRAL_FRAME_HEADER = struct.Struct("<QI")
+
+
+def _now() -> datetime:
+    # Looked up at call time (not bound as a default_factory) so tests can patch models._now
+    return datetime.now()
+
 
 class DeviceType(str, Enum):
     SPECTROMETER = "spectrometer"
@@ -36,6 +46,15 @@ class ConnectDeviceRequest(BaseModel):
     model_config = ConfigDict(json_schema_extra={"example": {"port": 8100, "address": "localhost"}})
 
 
+class DeviceCapabilities(BaseModel):
+    has_spectrometer: bool = Field(False, description="Device provides a spectrometer")
+    is_monochromatic: bool = Field(False, description="Whether the spectrometer is monochromatic")
+    has_vacuum_chamber: bool = Field(False, description="Device provides a vacuum chamber")
+    process_type: ProcessType | None = Field(None, description="Vacuum chamber process type, as reported by the device")
+
+    model_config = ConfigDict(extra="allow")
+
+
 class DeviceInfo(BaseModel):
     id: str = Field(default_factory=lambda: str(uuid4()), description="Device unique identifier")
     type: DeviceType = Field(..., description="Device type")
@@ -43,7 +62,7 @@ class DeviceInfo(BaseModel):
     address: str = Field(..., description="Device address")
     name: str = Field(..., description="Device name")
     status: DeviceStatus = Field(DeviceStatus.CONNECTED, description="Device connection status")
-    capabilities: dict = Field(default_factory=dict, description="Device capabilities")
+    capabilities: DeviceCapabilities = Field(default_factory=DeviceCapabilities, description="Device capabilities")
 
     model_config = ConfigDict(from_attributes=True)
 
@@ -69,7 +88,7 @@ class SpectrometerConfig(BaseModel):
     is_monochromatic: bool = Field(False, description="Whether this is a monochromatic spectrometer")
     control_wavelength: float | None = Field(None, description="Control wavelength in nm (monochromatic only)")
     is_active: bool = Field(False, description="Whether this is the active spectrometer")
-    created_at: datetime = Field(default_factory=datetime.now, description="Creation timestamp")
+    created_at: datetime = Field(default_factory=lambda: _now(), description="Creation timestamp")
 
     model_config = ConfigDict(from_attributes=True)
 
@@ -96,6 +115,22 @@ class PostSpectralDataRequest(BaseModel):
     )
 
 
+def decode_spectral_frame(body: bytes) -> tuple[datetime, np.ndarray, np.ndarray]:
+    """Split a binary spectral frame into its timestamp, readings and wavelengths.
+
+    The frame is SPECTRAL_FRAME_HEADER followed by N little-endian float32
+    calibrated readings and then N float32 wavelengths.
+    """
+    if len(body) < SPECTRAL_FRAME_HEADER.size:
+        raise ValueError("Spectral frame is shorter than its header")
+    timestamp_us, num_points = SPECTRAL_FRAME_HEADER.unpack_from(body)
+    expected = SPECTRAL_FRAME_HEADER.size + 8 * num_points
+    if len(body) != expected:
+        raise ValueError(f"Spectral frame has {len(body)} bytes, expected {expected} for {num_points} points")
+    values = np.frombuffer(body, dtype="<f4", offset=SPECTRAL_FRAME_HEADER.size)
+    return datetime.fromtimestamp(timestamp_us / 1_000_000), values[:num_points], values[num_points:]
+
+
 class SpectralData(BaseModel):
     timestamp: datetime = Field(..., description="Data timestamp")
     calibrated_readings: list[float] = Field(..., description="Calibrated spectral readings (0-100%)")
@@ -142,7 +177,7 @@ class VacuumChamberConfig(BaseModel):
     current_fraction: float | None = Field(None, description="Current deposition fraction")
     status: VacuumChamberStatus = Field(VacuumChamberStatus.STOPPED, description="Chamber status")
     is_active: bool = Field(False, description="Whether this is the active vacuum chamber")
-    created_at: datetime = Field(default_factory=datetime.now, description="Creation timestamp")
+    created_at: datetime = Field(default_factory=lambda: _now(), description="Creation timestamp")
 
     model_config = ConfigDict(from_attributes=True)
 
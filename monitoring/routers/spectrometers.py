@@ -1,20 +1,25 @@
 from __future__ import annotations
 
 import logging
+from datetime import datetime
 
 import httpx
-from fastapi import APIRouter, Depends, HTTPException
+import numpy as np
+from fastapi import APIRouter, BackgroundTasks, Depends, HTTPException, Request, Response
 
-from ..deps import get_registry
+from ..deps import get_device_client, get_registry, resolve_spectrometer, resolve_spectrometer_device
+from ..device_proxy import forward_to_device
 from ..device_registry import DeviceRegistry
 from ..models import (
     CreateSpectrometerRequest,
+    DeviceInfo,
     DeviceType,
     PostSpectralDataRequest,
     SetControlWavelengthRequest,
     SpectralData,
     SpectrometerConfig,
     SpectrometerDetails,
+    decode_spectral_frame,
 )
 from ..websocket_manager import ws_manager
 
@@ -32,12 +37,10 @@ async def create_spectrometer(request: CreateSpectrometerRequest, registry: Devi
     if device.type != DeviceType.SPECTROMETER:
         raise HTTPException(status_code=400, detail=f"Device {request.device_id} is not a spectrometer")
 
-    is_monochromatic = device.capabilities.get("is_monochromatic", False)
-
     config = SpectrometerConfig(
         device_id=request.device_id,
         name=request.name,
-        is_monochromatic=is_monochromatic,
+        is_monochromatic=device.capabilities.is_monochromatic,
         control_wavelength=None,
         is_active=False,
     )
@@ -51,18 +54,14 @@ async def list_spectrometers(registry: DeviceRegistry = Depends(get_registry)):
 
 
 @router.get("/{spectrometer_id}", response_model=SpectrometerDetails, operation_id="getSpectrometer")
-async def get_spectrometer(spectrometer_id: str, registry: DeviceRegistry = Depends(get_registry)):
-    config = registry.get_spectrometer(spectrometer_id)
-    if not config:
-        raise HTTPException(status_code=404, detail=f"Spectrometer {spectrometer_id} not found")
-
-    device = registry.get_device(config.device_id)
-    if not device:
-        raise HTTPException(status_code=404, detail=f"Device {config.device_id} not found")
-
-    latest_data = registry.get_spectral_data(spectrometer_id)
+async def get_spectrometer(
+    config: SpectrometerConfig = Depends(resolve_spectrometer),
+    device: DeviceInfo = Depends(resolve_spectrometer_device),
+    registry: DeviceRegistry = Depends(get_registry),
+):
+    latest_data = registry.get_spectral_data(config.id)
 
-    return SpectrometerDetails(
+    return SpectrometerDetails.model_construct(
         id=config.id,
         device_id=config.device_id,
         name=config.name,
@@ -78,12 +77,11 @@ async def get_spectrometer(spectrometer_id: str, registry: DeviceRegistry = Depe
     "/{spectrometer_id}/control_wavelength", response_model=SpectrometerConfig, operation_id="setControlWavelength"
 )
 async def set_control_wavelength(
-    spectrometer_id: str, request: SetControlWavelengthRequest, registry: DeviceRegistry = Depends(get_registry)
+    request: SetControlWavelengthRequest,
+    config: SpectrometerConfig = Depends(resolve_spectrometer),
+    registry: DeviceRegistry = Depends(get_registry),
+    client: httpx.AsyncClient = Depends(get_device_client),
 ):
-    config = registry.get_spectrometer(spectrometer_id)
-    if not config:
-        raise HTTPException(status_code=404, detail=f"Spectrometer {spectrometer_id} not found")
-
     if not config.is_monochromatic:
         raise HTTPException(status_code=400, detail="Control wavelength can only be set on monochromatic spectrometers")
 
@@ -91,21 +89,9 @@ async def set_control_wavelength(
     if not device:
         raise HTTPException(status_code=404, detail=f"Device {config.device_id} not found")
 
-    url = f"http://{device.address}:{device.port}/control_wavelength"
-    try:
-        async with httpx.AsyncClient() as client:
-            response = await client.post(url, json={"wavelength": request.wavelength}, timeout=5.0)
-            if response.status_code not in (200, 201, 204):
-                logger.warning(f"Failed to set control wavelength on device: {response.status_code}")
-                raise HTTPException(status_code=502, detail=f"Device returned error: {response.status_code}")
-    except httpx.TimeoutException:
-        logger.error(f"Timeout setting control wavelength on device at {url}")
-        raise HTTPException(status_code=504, detail="Timeout communicating with device")
-    except httpx.RequestError as e:
-        logger.error(f"Error setting control wavelength on device: {e}")
-        raise HTTPException(status_code=502, detail=f"Failed to communicate with device: {e}")
-
-    updated = registry.update_spectrometer(spectrometer_id, control_wavelength=request.wavelength)
+    await forward_to_device(client, device, "/control_wavelength", {"wavelength": request.wavelength})
+
+    updated = registry.update_spectrometer(config.id, control_wavelength=request.wavelength)
     if not updated:
         raise HTTPException(status_code=500, detail="Failed to update control wavelength")
 
@@ -114,42 +100,94 @@ async def set_control_wavelength(
 
 @router.post("/{spectrometer_id}/data", status_code=200, operation_id="postSpectralData")
 async def post_spectral_data(
-    spectrometer_id: str, request: PostSpectralDataRequest, registry: DeviceRegistry = Depends(get_registry)
+    request: PostSpectralDataRequest,
+    background_tasks: BackgroundTasks,
+    config: SpectrometerConfig = Depends(resolve_spectrometer),
+    registry: DeviceRegistry = Depends(get_registry),
 ):
-    config = registry.get_spectrometer(spectrometer_id)
-    if not config:
-        raise HTTPException(status_code=404, detail=f"Spectrometer {spectrometer_id} not found")
+    _store_and_broadcast(
+        registry, background_tasks, config.id, request.calibrated_readings, request.wavelengths, request.timestamp
+    )
+    return {}
 
-    logger.info(f"Received spectral data: {len(request.calibrated_readings)} points")
-    registry.store_spectral_data(spectrometer_id, request.calibrated_readings, request.wavelengths, request.timestamp)
 
-    # Get the stored data to broadcast with timestamp
-    stored_data = registry.get_spectral_data(spectrometer_id)
-    if stored_data:
-        logger.info(f"Broadcasting to {len(ws_manager.active_connections)} WebSocket clients")
-        await ws_manager.broadcast_spectral_data(
-            spectrometer_id, stored_data.timestamp.isoformat(), stored_data.calibrated_readings
-        )
+@router.post(
+    "/{spectrometer_id}/data/binary",
+    status_code=200,
+    operation_id="postSpectralDataBinary",
+    openapi_extra={
+        "requestBody": {
+            "required": True,
+            "description": "uint64 timestamp (us since epoch), uint32 N, N float32 readings, N float32 wavelengths; "
+            "all little-endian",
+            "content": {"application/octet-stream": {"schema": {"type": "string", "format": "binary"}}},
+        }
+    },
+)
+async def post_spectral_data_binary(
+    http_request: Request,
+    background_tasks: BackgroundTasks,
+    config: SpectrometerConfig = Depends(resolve_spectrometer),
+    registry: DeviceRegistry = Depends(get_registry),
+):
+    try:
+        timestamp, calibrated_readings, wavelengths = decode_spectral_frame(await http_request.body())
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
 
+    _store_and_broadcast(registry, background_tasks, config.id, calibrated_readings, wavelengths, timestamp)
     return {}
 
 
+def _store_and_broadcast(
+    registry: DeviceRegistry,
+    background_tasks: BackgroundTasks,
+    spectrometer_id: str,
+    calibrated_readings: list[float] | np.ndarray,
+    wavelengths: list[float] | np.ndarray,
+    timestamp: datetime,
+) -> None:
+    logger.info("Received spectral data: %d points", len(calibrated_readings))
+    stored_data = registry.store_spectral_data(spectrometer_id, calibrated_readings, wavelengths, timestamp)
+
+    # Broadcast the stored arrays as-is once the device has its response; the WebSocket
+    # manager serializes ndarrays directly
+    if ws_manager.has_connections:
+        background_tasks.add_task(
+            ws_manager.broadcast_spectral_data, spectrometer_id, stored_data.timestamp, stored_data.readings
+        )
+
+
 @router.get("/{spectrometer_id}/data", response_model=SpectralData | None, operation_id="getSpectralData")
-async def get_spectral_data(spectrometer_id: str, registry: DeviceRegistry = Depends(get_registry)):
-    config = registry.get_spectrometer(spectrometer_id)
-    if not config:
-        raise HTTPException(status_code=404, detail=f"Spectrometer {spectrometer_id} not found")
+async def get_spectral_data(
+    http_request: Request,
+    config: SpectrometerConfig = Depends(resolve_spectrometer),
+    registry: DeviceRegistry = Depends(get_registry),
+):
+    # Returned as pre-serialized bytes; response_model still documents the schema
+    cached = registry.get_spectral_json(config.id)
+    if cached is None:
+        return None
+    payload, etag = cached
 
-    return registry.get_spectral_data(spectrometer_id)
+    # Pollers revalidate with If-None-Match and get an empty 304 until a new spectrum is stored
+    headers = {"ETag": etag, "Cache-Control": "no-cache"}
+    if _etag_matches(http_request.headers.get("if-none-match"), etag):
+        return Response(status_code=304, headers=headers)
+    return Response(content=payload, media_type="application/json", headers=headers)
 
 
-@router.post("/{spectrometer_id}/activate", response_model=SpectrometerConfig, operation_id="activateSpectrometer")
-async def activate_spectrometer(spectrometer_id: str, registry: DeviceRegistry = Depends(get_registry)):
-    if not registry.set_active_spectrometer(spectrometer_id):
-        raise HTTPException(status_code=404, detail=f"Spectrometer {spectrometer_id} not found")
+def _etag_matches(if_none_match: str | None, etag: str) -> bool:
+    if not if_none_match:
+        return False
+    return any(tag.strip().removeprefix("W/") in (etag, "*") for tag in if_none_match.split(","))
 
-    config = registry.get_spectrometer(spectrometer_id)
-    return config
+
+@router.post("/{spectrometer_id}/activate", response_model=SpectrometerConfig, operation_id="activateSpectrometer")
+async def activate_spectrometer(
+    config: SpectrometerConfig = Depends(resolve_spectrometer), registry: DeviceRegistry = Depends(get_registry)
+):
+    return registry.set_active_spectrometer(config.id)
 
 
 @router.delete("/{spectrometer_id}", status_code=204, operation_id="deleteSpectrometer")
@@ -5,10 +5,12 @@ import logging
 import httpx
 from fastapi import APIRouter, Depends, HTTPException
 
-from ..deps import get_registry
+from ..deps import get_device_client, get_registry, resolve_vacuum_chamber, resolve_vacuum_chamber_device
+from ..device_proxy import forward_to_device
 from ..device_registry import DeviceRegistry
 from ..models import (
     CreateVacuumChamberRequest,
+    DeviceInfo,
     DeviceType,
     SetFractionRequest,
     SetMaterialRequest,
@@ -50,16 +52,11 @@ async def list_vacuum_chambers(registry: DeviceRegistry = Depends(get_registry))
 
 
 @router.get("/{chamber_id}", response_model=VacuumChamberDetails, operation_id="getVacuumChamber")
-async def get_vacuum_chamber(chamber_id: str, registry: DeviceRegistry = Depends(get_registry)):
-    config = registry.get_vacuum_chamber(chamber_id)
-    if not config:
-        raise HTTPException(status_code=404, detail=f"Vacuum chamber {chamber_id} not found")
-
-    device = registry.get_device(config.device_id)
-    if not device:
-        raise HTTPException(status_code=404, detail=f"Device {config.device_id} not found")
-
-    return VacuumChamberDetails(
+async def get_vacuum_chamber(
+    config: VacuumChamberConfig = Depends(resolve_vacuum_chamber),
+    device: DeviceInfo = Depends(resolve_vacuum_chamber_device),
+):
+    return VacuumChamberDetails.model_construct(
         id=config.id,
         device_id=config.device_id,
         name=config.name,
@@ -73,115 +70,82 @@ async def get_vacuum_chamber(chamber_id: str, registry: DeviceRegistry = Depends
 
 
 @router.post("/{chamber_id}/start", response_model=VacuumChamberConfig, operation_id="startDeposition")
-async def start_deposition(chamber_id: str, registry: DeviceRegistry = Depends(get_registry)):
-    config = registry.get_vacuum_chamber(chamber_id)
-    if not config:
-        raise HTTPException(status_code=404, detail=f"Vacuum chamber {chamber_id} not found")
-
-    # Get the device
-    device = registry.get_device(config.device_id)
-    if not device:
-        raise HTTPException(status_code=404, detail=f"Device {config.device_id} not found")
-
-    try:
-        async with httpx.AsyncClient() as client:
-            device_url = f"http://{device.address}:{device.port}/vacuum_chamber/start"
-            response = await client.post(device_url, timeout=5.0)
-            response.raise_for_status()
-    except Exception as e:
-        logger.error(f"Failed to start deposition on device: {e}")
-        raise HTTPException(status_code=500, detail=f"Failed to start deposition on device: {str(e)}")
-
-    updated = registry.update_vacuum_chamber(chamber_id, status=VacuumChamberStatus.RUNNING)
+async def start_deposition(
+    config: VacuumChamberConfig = Depends(resolve_vacuum_chamber),
+    device: DeviceInfo = Depends(resolve_vacuum_chamber_device),
+    registry: DeviceRegistry = Depends(get_registry),
+    client: httpx.AsyncClient = Depends(get_device_client),
+):
+    await forward_to_device(client, device, "/vacuum_chamber/start")
+
+    updated = registry.update_vacuum_chamber(config.id, status=VacuumChamberStatus.RUNNING)
     if not updated:
         raise HTTPException(status_code=500, detail="Failed to update chamber status")
 
-    logger.info(f"Started deposition on vacuum chamber {chamber_id}")
+    logger.info(f"Started deposition on vacuum chamber {config.id}")
     return updated
 
 
 @router.post("/{chamber_id}/stop", response_model=VacuumChamberConfig, operation_id="stopDeposition")
-async def stop_deposition(chamber_id: str, registry: DeviceRegistry = Depends(get_registry)):
-    config = registry.get_vacuum_chamber(chamber_id)
-    if not config:
-        raise HTTPException(status_code=404, detail=f"Vacuum chamber {chamber_id} not found")
-
-    # Get the device
-    device = registry.get_device(config.device_id)
-    if not device:
-        raise HTTPException(status_code=404, detail=f"Device {config.device_id} not found")
-
-    try:
-        async with httpx.AsyncClient() as client:
-            device_url = f"http://{device.address}:{device.port}/vacuum_chamber/stop"
-            response = await client.post(device_url, timeout=5.0)
-            response.raise_for_status()
-    except Exception as e:
-        logger.error(f"Failed to stop deposition on device: {e}")
-        raise HTTPException(status_code=500, detail=f"Failed to stop deposition on device: {str(e)}")
-
-    updated = registry.update_vacuum_chamber(chamber_id, status=VacuumChamberStatus.STOPPED)
+async def stop_deposition(
+    config: VacuumChamberConfig = Depends(resolve_vacuum_chamber),
+    device: DeviceInfo = Depends(resolve_vacuum_chamber_device),
+    registry: DeviceRegistry = Depends(get_registry),
+    client: httpx.AsyncClient = Depends(get_device_client),
+):
+    await forward_to_device(client, device, "/vacuum_chamber/stop")
+
+    updated = registry.update_vacuum_chamber(config.id, status=VacuumChamberStatus.STOPPED)
     if not updated:
         raise HTTPException(status_code=500, detail="Failed to update chamber status")
 
-    logger.info(f"Stopped deposition on vacuum chamber {chamber_id}")
+    logger.info(f"Stopped deposition on vacuum chamber {config.id}")
     return updated
 
 
 @router.put("/{chamber_id}/material", response_model=VacuumChamberConfig, operation_id="setMaterial")
-async def set_material(chamber_id: str, request: SetMaterialRequest, registry: DeviceRegistry = Depends(get_registry)):
-    config = registry.get_vacuum_chamber(chamber_id)
-    if not config:
-        raise HTTPException(status_code=404, detail=f"Vacuum chamber {chamber_id} not found")
-
-    # Get the device
-    device = registry.get_device(config.device_id)
-    if not device:
-        raise HTTPException(status_code=404, detail=f"Device {config.device_id} not found")
-
+async def set_material(
+    request: SetMaterialRequest,
+    config: VacuumChamberConfig = Depends(resolve_vacuum_chamber),
+    device: DeviceInfo = Depends(resolve_vacuum_chamber_device),
+    registry: DeviceRegistry = Depends(get_registry),
+    client: httpx.AsyncClient = Depends(get_device_client),
+):
     # Forward material and fraction to device
-    try:
-        async with httpx.AsyncClient() as client:
-            device_url = f"http://{device.address}:{device.port}/vacuum_chamber/material"
-            payload = {"material": request.material, "fraction": request.fraction}
-            response = await client.post(device_url, json=payload, timeout=5.0)
-            response.raise_for_status()
-    except Exception as e:
-        logger.error(f"Failed to set material on device: {e}")
-        raise HTTPException(status_code=500, detail=f"Failed to set material on device: {str(e)}")
+    await forward_to_device(
+        client, device, "/vacuum_chamber/material", {"material": request.material, "fraction": request.fraction}
+    )
 
     # Update registry cache
     updated = registry.update_vacuum_chamber(
-        chamber_id, current_material=request.material, current_fraction=request.fraction
+        config.id, current_material=request.material, current_fraction=request.fraction
     )
     if not updated:
         raise HTTPException(status_code=500, detail="Failed to update chamber")
 
-    logger.info(f"Set material on vacuum chamber {chamber_id}: {request.material} (fraction: {request.fraction}%)")
+    logger.info(f"Set material on vacuum chamber {config.id}: {request.material} (fraction: {request.fraction}%)")
     return updated
 
 
 @router.put("/{chamber_id}/fraction", response_model=VacuumChamberConfig, operation_id="setFraction")
-async def set_fraction(chamber_id: str, request: SetFractionRequest, registry: DeviceRegistry = Depends(get_registry)):
-    config = registry.get_vacuum_chamber(chamber_id)
-    if not config:
-        raise HTTPException(status_code=404, detail=f"Vacuum chamber {chamber_id} not found")
-
-    updated = registry.update_vacuum_chamber(chamber_id, current_fraction=request.fraction)
+async def set_fraction(
+    request: SetFractionRequest,
+    config: VacuumChamberConfig = Depends(resolve_vacuum_chamber),
+    registry: DeviceRegistry = Depends(get_registry),
+):
+    updated = registry.update_vacuum_chamber(config.id, current_fraction=request.fraction)
     if not updated:
         raise HTTPException(status_code=500, detail="Failed to set fraction")
 
-    logger.info(f"Set fraction on vacuum chamber {chamber_id}: {request.fraction}")
+    logger.info(f"Set fraction on vacuum chamber {config.id}: {request.fraction}")
     return updated
 
 
 @router.post("/{chamber_id}/activate", response_model=VacuumChamberConfig, operation_id="activateVacuumChamber")
-async def activate_vacuum_chamber(chamber_id: str, registry: DeviceRegistry = Depends(get_registry)):
-    if not registry.set_active_vacuum_chamber(chamber_id):
-        raise HTTPException(status_code=404, detail=f"Vacuum chamber {chamber_id} not found")
-
-    config = registry.get_vacuum_chamber(chamber_id)
-    return config
+async def activate_vacuum_chamber(
+    config: VacuumChamberConfig = Depends(resolve_vacuum_chamber), registry: DeviceRegistry = Depends(get_registry)
+):
+    return registry.set_active_vacuum_chamber(config.id)
 
 
 @router.delete("/{chamber_id}", status_code=204, operation_id="deleteVacuumChamber")
@@ -2,12 +2,15 @@ from __future__ import annotations
 
 import argparse
 import logging
+from contextlib import asynccontextmanager
 
 import uvicorn
-from fastapi import FastAPI, WebSocket
+from fastapi import FastAPI, Request, Response, WebSocket
+from fastapi.responses import JSONResponse
 
 from monitoring import deps
 
+from .device_proxy import DeviceForwardError
 from .device_registry import DeviceRegistry
 from .routers import devices, monitoring, spectrometers, vacuum_chambers
 from .websocket_manager import ws_manager
@@ -15,18 +18,35 @@ from .websocket_manager import ws_manager
 logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
 
+# Shared by every probe: the body never changes, so nothing is built or serialized per request
+_HEALTH_RESPONSE = Response(content=b'{"status":"ok"}', media_type="application/json")
+_HEALTH_PROBE_RESPONSE = Response()
+
 
 def create_app(registry: DeviceRegistry | None = None) -> FastAPI:
+    if registry is None:
+        registry = DeviceRegistry()
+
+    deps.set_registry(registry)
+
+    @asynccontextmanager
+    async def lifespan(app: FastAPI):
+        await registry.startup()
+        try:
+            yield
+        finally:
+            await registry.aclose()
+
     app = FastAPI(
         title="OptiMonitor Monitoring API",
         description="REST API for managing spectrometers and vacuum chambers",
         version="1.0.0",
+        lifespan=lifespan,
     )
 
-    if registry is None:
-        registry = DeviceRegistry()
-
-    deps.set_registry(registry)
+    @app.exception_handler(DeviceForwardError)
+    async def device_forward_error_handler(request: Request, exc: DeviceForwardError):
+        return JSONResponse(status_code=exc.status_code, content={"detail": exc.detail})
 
     app.include_router(devices.router)
     app.include_router(spectrometers.router)
@@ -35,16 +55,24 @@ def create_app(registry: DeviceRegistry | None = None) -> FastAPI:
 
     @app.get("/health")
     async def health_check():
-        return {"status": "ok"}
+        return _HEALTH_RESPONSE
+
+    @app.head("/health")
+    async def health_probe():
+        return _HEALTH_PROBE_RESPONSE
 
     @app.websocket("/ws/spectral-data")
     async def websocket_endpoint(websocket: WebSocket):
         """WebSocket endpoint for streaming spectral data."""
-        await ws_manager.connect(websocket)
+        if not await ws_manager.connect(websocket):
+            return
         try:
-            while True:
-                await websocket.receive_text()
-        except Exception:
+            # Suspended until the client sends something or the connection ends; incoming messages
+            # are ignored. Clients that vanish silently are caught by uvicorn's ping/pong keepalive
+            # (ws_ping_interval/ws_ping_timeout), which closes them and ends this loop.
+            while (await websocket.receive())["type"] != "websocket.disconnect":
+                pass
+        finally:
             ws_manager.disconnect(websocket)
 
     return app
@@ -1,9 +1,12 @@
 """WebSocket manager for broadcasting spectral data."""
 
-import json
+import asyncio
+import contextlib
 import logging
-from typing import Set
+from datetime import datetime
 
+import numpy as np
+import orjson
 from fastapi import WebSocket
 
 logger = logging.getLogger(__name__)
@@ -12,49 +15,101 @@ logger = logging.getLogger(__name__)
 class WebSocketManager:
     """Manages WebSocket connections for spectral data broadcasting."""
 
+    # Frames buffered per client; when full, the oldest frame is dropped
+    SEND_QUEUE_SIZE = 8
+    # A client that takes longer than this to accept one frame is disconnected
+    SEND_TIMEOUT = 2.0
+    # Further clients are turned away with close code 1013 (try again later)
+    MAX_CONNECTIONS = 500
+
     def __init__(self):
-        self.active_connections: Set[WebSocket] = set()
+        # Replaced (never mutated) on connect/disconnect, so readers always see a consistent tuple.
+        self._connections_snapshot: tuple[WebSocket, ...] = ()
+        self._send_queues: dict[WebSocket, asyncio.Queue] = {}
+        self._senders: dict[WebSocket, asyncio.Task] = {}
+
+    @property
+    def active_connections(self) -> tuple[WebSocket, ...]:
+        return self._connections_snapshot
+
+    @property
+    def has_connections(self) -> bool:
+        return bool(self._connections_snapshot)
 
-    async def connect(self, websocket: WebSocket):
-        """Accept a new WebSocket connection."""
+    async def connect(self, websocket: WebSocket) -> bool:
+        """Accept a new WebSocket connection and start its sender task.
+
+        Returns False if the connection limit is reached; the socket is then closed.
+        """
         await websocket.accept()
-        self.active_connections.add(websocket)
+        if len(self._send_queues) >= self.MAX_CONNECTIONS:
+            logger.warning("Rejecting WebSocket: %d connections already open", len(self._send_queues))
+            await websocket.close(code=1013)
+            return False
+        if websocket not in self._send_queues:
+            queue = asyncio.Queue(maxsize=self.SEND_QUEUE_SIZE)
+            self._send_queues[websocket] = queue
+            self._senders[websocket] = asyncio.create_task(self._run_sender(websocket, queue))
+            self._connections_snapshot = self._connections_snapshot + (websocket,)
         logger.info(f"WebSocket connected. Total connections: {len(self.active_connections)}")
+        return True
 
     def disconnect(self, websocket: WebSocket):
-        """Remove a WebSocket connection."""
-        self.active_connections.discard(websocket)
+        """Remove a WebSocket connection and stop its sender task."""
+        if self._send_queues.pop(websocket, None) is None:
+            return
+        sender = self._senders.pop(websocket)
+        if sender is not asyncio.current_task():
+            sender.cancel()
+        self._connections_snapshot = tuple(c for c in self._connections_snapshot if c is not websocket)
         logger.info(f"WebSocket disconnected. Total connections: {len(self.active_connections)}")
 
-    async def broadcast_spectral_data(self, spectrometer_id: str, timestamp: str, calibrated_readings: list[float]):
-        """Broadcast spectral data to all connected clients."""
-        if not self.active_connections:
+    async def _run_sender(self, websocket: WebSocket, queue: asyncio.Queue):
+        """Deliver queued frames to one client, so a slow client only delays itself."""
+        while True:
+            frame = await queue.get()
+            try:
+                async with asyncio.timeout(self.SEND_TIMEOUT):
+                    await websocket.send(frame)
+            except Exception as e:
+                logger.warning("Failed to send to WebSocket client: %r", e)
+                self.disconnect(websocket)
+                with contextlib.suppress(Exception):
+                    async with asyncio.timeout(self.SEND_TIMEOUT):
+                        await websocket.close()
+                return
+
+    async def broadcast_spectral_data(
+        self, spectrometer_id: str, timestamp: datetime, calibrated_readings: list[float] | np.ndarray
+    ):
+        """Queue spectral data for all connected clients."""
+        if not self._send_queues:
             logger.warning("No active WebSocket connections to broadcast to")
             return
 
+        if isinstance(calibrated_readings, np.ndarray):
+            # Widened like the REST endpoints, so float32 spectra print the same digits everywhere
+            calibrated_readings = calibrated_readings.astype(np.float64, copy=False)
+
         message = {
             "spectrometer_id": spectrometer_id,
             "timestamp": timestamp,
             "calibrated_readings": calibrated_readings,
         }
 
-        message_json = json.dumps(message)
-        disconnected = set()
+        # Serialized once for all clients; orjson writes the datetime and the reading array directly in C
+        message_json = orjson.dumps(message, option=orjson.OPT_SERIALIZE_NUMPY).decode()
+        frame = {"type": "websocket.send", "text": message_json}
 
         logger.info(
-            f"Broadcasting spectral data to {len(self.active_connections)} clients: {len(calibrated_readings)} points"
+            "Broadcasting spectral data to %d clients: %d points", len(self._send_queues), len(calibrated_readings)
         )
 
-        for connection in self.active_connections:
-            try:
-                await connection.send_text(message_json)
-                logger.debug("Sent data to WebSocket client")
-            except Exception as e:
-                logger.warning(f"Failed to send to WebSocket client: {e}")
-                disconnected.add(connection)
-
-        for connection in disconnected:
-            self.disconnect(connection)
+        for queue in self._send_queues.values():
+            if queue.full():
+                # Lagging client: the newest spectrum matters more than one it has not read yet
+                queue.get_nowait()
+            queue.put_nowait(frame)
 
 
 # Global WebSocket manager instance
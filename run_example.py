@@ -33,10 +33,7 @@ def start_monitoring_server(port: int = 8200):
     config = uvicorn.Config(app, host="0.0.0.0", port=port, log_level="info")
     server = uvicorn.Server(config)
 
-    def run():
-        asyncio.run(server.serve())
-
-    thread = Thread(target=run, daemon=True)
+    thread = Thread(target=server.run, daemon=True)
     thread.start()
     logger.info(f"Monitoring server starting on port {port}")
     return thread
@@ -58,27 +55,24 @@ def start_virtual_spectrometer(port: int = 8100):
     config = uvicorn.Config(app, host="0.0.0.0", port=port, log_level="info")
     server = uvicorn.Server(config)
 
-    def run():
-        asyncio.run(server.serve())
-
-    thread = Thread(target=run, daemon=True)
+    thread = Thread(target=server.run, daemon=True)
     thread.start()
     logger.info(f"Virtual spectrometer starting on port {port}")
     return thread
 
 
-async def wait_for_server(url: str, timeout: int = 10, health_endpoint: str = "/health"):
+async def wait_for_server(client: httpx.AsyncClient, url: str, timeout: int = 10, health_endpoint: str = "/health"):
     """Wait for a server to become available."""
     start_time = time.time()
-    async with httpx.AsyncClient() as client:
-        while time.time() - start_time < timeout:
-            try:
-                response = await client.get(f"{url}{health_endpoint}", timeout=2.0)
-                if response.status_code == 200:
-                    logger.info(f"Server at {url} is ready")
-                    return True
-            except Exception:
-                await asyncio.sleep(0.5)
+    while time.time() - start_time < timeout:
+        try:
+            response = await client.get(f"{url}{health_endpoint}", timeout=2.0)
+            if response.status_code == 200:
+                logger.info(f"Server at {url} is ready")
+                return True
+        except Exception:
+            pass
+        await asyncio.sleep(0.5)
     logger.error(f"Server at {url} did not become ready in {timeout}s")
     return False
 
@@ -99,15 +93,16 @@ async def run_workflow():
     time.sleep(1)
     spectrometer_thread = start_virtual_spectrometer(spectrometer_port)
 
-    logger.info("\nStep 2: Waiting for servers to be ready...")
-    if not await wait_for_server(monitoring_url):
-        logger.error("Monitoring server failed to start")
-        return
-    if not await wait_for_server(spectrometer_url, health_endpoint="/device/info"):
-        logger.error("Virtual spectrometer failed to start")
-        return
-
+    # One client (and its keep-alive connections) serves the readiness checks and every workflow step
     async with httpx.AsyncClient() as client:
+        logger.info("\nStep 2: Waiting for servers to be ready...")
+        if not await wait_for_server(client, monitoring_url):
+            logger.error("Monitoring server failed to start")
+            return
+        if not await wait_for_server(client, spectrometer_url, health_endpoint="/device/info"):
+            logger.error("Virtual spectrometer failed to start")
+            return
+
         logger.info("\nStep 3: Connecting device to monitoring API...")
         try:
             response = await client.post(
@@ -148,10 +143,17 @@ async def run_workflow():
 
         logger.info("\nStep 6: Monitoring spectral data for 10 seconds...")
         logger.info("-" * 80)
+        etag = None
         for i in range(20):
             try:
-                response = await client.get(f"{monitoring_url}/spectrometers/{spectrometer_id}/data", timeout=5.0)
-                if response.status_code == 200:
+                headers = {"If-None-Match": etag} if etag else None
+                response = await client.get(
+                    f"{monitoring_url}/spectrometers/{spectrometer_id}/data", headers=headers, timeout=5.0
+                )
+                if response.status_code == 304:
+                    logger.info(f"  [{i + 1}/20] No new spectral data since last poll")
+                elif response.status_code == 200:
+                    etag = response.headers.get("etag")
                     data = response.json()
                     if data:
                         num_points = len(data["calibrated_readings"])
@@ -0,0 +1,120 @@
+"""Tests for forwarding commands to devices."""
+
+from __future__ import annotations
+
+import httpx
+import pytest
+
+from monitoring import device_proxy
+from monitoring.device_proxy import DeviceForwardError, forward_to_device
+from monitoring.device_registry import DeviceRegistry
+from monitoring.models import DeviceInfo, DeviceType, VacuumChamberConfig
+from monitoring.server import create_app
+
+DEVICE = DeviceInfo(type=DeviceType.SPECTROMETER, port=8100, address="localhost", name="Spectro")
+
+
+@pytest.fixture(autouse=True)
+def no_backoff(monkeypatch):
+    monkeypatch.setattr(device_proxy, "RETRY_BACKOFF", (0.0, 0.0))
+
+
+def _client(*outcomes: int | Exception) -> tuple[httpx.AsyncClient, list[httpx.Request]]:
+    """Client whose successive requests get the given status codes or raise the given errors."""
+    requests: list[httpx.Request] = []
+
+    def handler(request: httpx.Request) -> httpx.Response:
+        requests.append(request)
+        outcome = outcomes[len(requests) - 1]
+        if isinstance(outcome, Exception):
+            raise outcome
+        return httpx.Response(outcome, json={})
+
+    return httpx.AsyncClient(transport=httpx.MockTransport(handler)), requests
+
+
+async def test_forwards_post_to_device():
+    client, requests = _client(200)
+    async with client:
+        response = await forward_to_device(client, DEVICE, "/start", {"material": "H"})
+
+    assert response.status_code == 200
+    assert str(requests[0].url) == "http://localhost:8100/start"
+    assert requests[0].content == b'{"material":"H"}'
+
+
+async def test_retries_server_errors_until_success():
+    client, requests = _client(503, 500, 200)
+    async with client:
+        response = await forward_to_device(client, DEVICE, "/start")
+
+    assert response.status_code == 200
+    assert len(requests) == 3
+
+
+async def test_retries_timeouts_until_success():
+    client, requests = _client(httpx.ReadTimeout("slow"), 200)
+    async with client:
+        response = await forward_to_device(client, DEVICE, "/start")
+
+    assert response.status_code == 200
+    assert len(requests) == 2
+
+
+async def test_persistent_server_error_maps_to_502():
+    client, requests = _client(503, 503, 503)
+    async with client:
+        with pytest.raises(DeviceForwardError) as exc_info:
+            await forward_to_device(client, DEVICE, "/start")
+
+    assert exc_info.value.status_code == 502
+    assert len(requests) == 3
+
+
+async def test_persistent_timeout_maps_to_504():
+    client, requests = _client(*(httpx.ReadTimeout("slow") for _ in range(3)))
+    async with client:
+        with pytest.raises(DeviceForwardError) as exc_info:
+            await forward_to_device(client, DEVICE, "/start")
+
+    assert exc_info.value.status_code == 504
+    assert len(requests) == 3
+
+
+async def test_client_error_is_not_retried():
+    client, requests = _client(404)
+    async with client:
+        with pytest.raises(DeviceForwardError) as exc_info:
+            await forward_to_device(client, DEVICE, "/start")
+
+    assert exc_info.value.status_code == 502
+    assert len(requests) == 1
+
+
+async def test_connection_error_is_not_retried():
+    client, requests = _client(httpx.ConnectError("refused"))
+    async with client:
+        with pytest.raises(DeviceForwardError) as exc_info:
+            await forward_to_device(client, DEVICE, "/start")
+
+    assert exc_info.value.status_code == 502
+    assert len(requests) == 1
+
+
+async def test_forward_error_is_returned_as_http_status():
+    registry = DeviceRegistry()
+    client, _ = _client(*(httpx.ReadTimeout("slow") for _ in range(3)))
+    registry._client = client
+    device = DeviceInfo(type=DeviceType.VACUUM_CHAMBER, port=8100, address="localhost", name="Chamber")
+    registry.devices[device.id] = device
+    chamber = registry.add_vacuum_chamber(
+        VacuumChamberConfig(device_id=device.id, name="Chamber", process_type="two-component")
+    )
+
+    transport = httpx.ASGITransport(app=create_app(registry))
+    async with httpx.AsyncClient(transport=transport, base_url="http://test") as api, client:
+        response = await api.post(f"/vacuum-chambers/{chamber.id}/start")
+
+    assert response.status_code == 504
+    assert response.json() == {"detail": "Timeout communicating with device"}
+    assert registry.get_vacuum_chamber(chamber.id).status == "stopped"
@@ -0,0 +1,193 @@
+"""Tests for the in-memory device registry."""
+
+from __future__ import annotations
+
+import asyncio
+from datetime import datetime
+
+import httpx
+import numpy as np
+import orjson
+import pytest
+
+from monitoring import models
+from monitoring.device_registry import DeviceRegistry
+from monitoring.models import ProcessType, SpectrometerConfig, VacuumChamberConfig
+from monitoring.websocket_manager import WebSocketManager
+
+from .test_websocket_manager import FakeWebSocket, wait_until
+
+
+def test_device_index_moves_to_remaining_spectrometer():
+    registry = DeviceRegistry()
+    first = registry.add_spectrometer(SpectrometerConfig(device_id="dev", name="First"))
+    second = registry.add_spectrometer(SpectrometerConfig(device_id="dev", name="Second"))
+    assert registry.get_spectrometer_by_device("dev") is first
+
+    registry.remove_spectrometer(first.id)
+    assert registry.get_spectrometer_by_device("dev") is second
+
+    registry.remove_spectrometer(second.id)
+    assert registry.get_spectrometer_by_device("dev") is None
+
+
+def test_device_index_moves_to_remaining_vacuum_chamber():
+    registry = DeviceRegistry()
+    first = registry.add_vacuum_chamber(
+        VacuumChamberConfig(device_id="dev", name="First", process_type="two-component")
+    )
+    second = registry.add_vacuum_chamber(
+        VacuumChamberConfig(device_id="dev", name="Second", process_type="two-component")
+    )
+
+    registry.remove_vacuum_chamber(first.id)
+    assert registry.get_vacuum_chamber_by_device("dev") is second
+
+    registry.remove_vacuum_chamber(second.id)
+    assert registry.get_vacuum_chamber_by_device("dev") is None
+
+
+def _registry_with_device(
+    info: dict, calls: list[str] | None = None, registered: list[dict] | None = None
+) -> DeviceRegistry:
+    """Registry whose HTTP client answers /device/info with `info` and accepts /register."""
+
+    async def handler(request: httpx.Request) -> httpx.Response:
+        if calls is not None:
+            calls.append(request.url.path)
+        await asyncio.sleep(0.01)
+        if request.url.path == "/device/info":
+            return httpx.Response(200, json=info)
+        if registered is not None:
+            registered.append(orjson.loads(request.content))
+        return httpx.Response(200, json={"status": "registered"})
+
+    registry = DeviceRegistry()
+    registry._client = httpx.AsyncClient(transport=httpx.MockTransport(handler))
+    return registry
+
+
+async def test_discovery_ignores_unknown_process_type_without_vacuum_chamber():
+    registry = _registry_with_device(
+        {
+            "type": "spectrometer",
+            "name": "Spectro",
+            "capabilities": {"has_spectrometer": True, "process_type": "four-component"},
+        }
+    )
+    device, spectrometer_id, vacuum_chamber_id = await registry.discover_device(8100, "localhost", "http://monitor")
+    await registry.aclose()
+
+    assert device is not None
+    assert device.capabilities.process_type is None
+    assert spectrometer_id in registry.spectrometers
+    assert vacuum_chamber_id is None
+
+
+async def test_discovery_defaults_unreported_process_type_for_vacuum_chamber():
+    registry = _registry_with_device(
+        {"type": "vacuum-chamber", "name": "Chamber", "capabilities": {"has_vacuum_chamber": True}}
+    )
+    device, _, vacuum_chamber_id = await registry.discover_device(8100, "localhost", "http://monitor")
+    await registry.aclose()
+
+    assert device.capabilities.process_type is None
+    assert registry.vacuum_chambers[vacuum_chamber_id].process_type == ProcessType.TWO_COMPONENT
+
+
+async def test_discovery_rejects_unknown_process_type_for_vacuum_chamber():
+    registry = _registry_with_device(
+        {
+            "type": "vacuum-chamber",
+            "name": "Chamber",
+            "capabilities": {"has_vacuum_chamber": True, "process_type": "four-component"},
+        }
+    )
+    result = await registry.discover_device(8100, "localhost", "http://monitor")
+    await registry.aclose()
+
+    assert result == (None, None, None)
+    assert not registry.devices
+
+
+async def test_discovery_timestamps_components_with_models_clock(monkeypatch):
+    frozen = datetime(2025, 1, 15, 10, 30)
+    monkeypatch.setattr(models, "_now", lambda: frozen)
+    registry = _registry_with_device(
+        {
+            "type": "spectrometer",
+            "name": "Combo",
+            "capabilities": {"has_spectrometer": True, "has_vacuum_chamber": True},
+        }
+    )
+    _, spectrometer_id, vacuum_chamber_id = await registry.discover_device(8100, "localhost", "http://monitor")
+    await registry.aclose()
+
+    assert registry.spectrometers[spectrometer_id].created_at == frozen
+    assert registry.vacuum_chambers[vacuum_chamber_id].created_at == frozen
+    assert SpectrometerConfig(device_id="dev", name="Manual").created_at == frozen
+
+
+async def test_concurrent_discovery_is_coalesced():
+    calls: list[str] = []
+    registry = _registry_with_device(
+        {"type": "spectrometer", "name": "Spectro", "capabilities": {"has_spectrometer": True}}, calls
+    )
+    first, second = await asyncio.gather(
+        registry.discover_device(8100, "localhost", "http://monitor"),
+        registry.discover_device(8100, "localhost", "http://monitor"),
+    )
+    await registry.aclose()
+
+    assert first == second
+    assert calls == ["/device/info", "/register"]
+    assert len(registry.devices) == 1
+    assert len(registry.spectrometers) == 1
+
+
+async def test_reconnect_to_connected_device_re_registers_existing_ids():
+    calls: list[str] = []
+    registered: list[dict] = []
+    registry = _registry_with_device(
+        {"type": "spectrometer", "name": "Spectro", "capabilities": {"has_spectrometer": True}}, calls, registered
+    )
+    first = await registry.discover_device(8100, "localhost", "http://monitor")
+    second = await registry.discover_device(8100, "localhost", "http://monitor")
+    await registry.aclose()
+
+    assert first == second
+    assert len(registry.devices) == 1
+    assert calls == ["/device/info", "/register", "/register"]
+    assert (
+        registered[0]
+        == registered[1]
+        == {
+            "monitoring_api_url": "http://monitor",
+            "spectrometer_id": first[1],
+            "vacuum_chamber_id": None,
+        }
+    )
+
+
+@pytest.mark.parametrize("dtype", [np.float32, np.float64])
+async def test_spectral_json_matches_model_and_broadcast(dtype):
+    registry = DeviceRegistry()
+    stored = registry.store_spectral_data(
+        "spec",
+        np.array([1700 / 3, 12.1], dtype=dtype),
+        np.array([400.0, 401.7], dtype=dtype),
+        datetime(2025, 1, 15, 10, 30),
+    )
+    payload, _ = registry.get_spectral_json("spec")
+
+    assert payload == registry.get_spectral_data("spec").model_dump_json().encode()
+
+    manager = WebSocketManager()
+    ws = FakeWebSocket()
+    await manager.connect(ws)
+    await manager.broadcast_spectral_data("spec", stored.timestamp, stored.readings)
+    await wait_until(lambda: ws.sent)
+    manager.disconnect(ws)
+
+    broadcast = orjson.loads(ws.sent[0]["text"])
+    assert broadcast["calibrated_readings"] == orjson.loads(payload)["calibrated_readings"]
@@ -0,0 +1,44 @@
+"""Tests for the monitoring API models and the binary spectral frame format."""
+
+from __future__ import annotations
+
+from datetime import datetime
+
+import numpy as np
+import pytest
+
+from monitoring.models import SPECTRAL_FRAME_HEADER, decode_spectral_frame
+
+
+def _frame(timestamp: datetime, readings: list[float], wavelengths: list[float]) -> bytes:
+    header = SPECTRAL_FRAME_HEADER.pack(round(timestamp.timestamp() * 1_000_000), len(readings))
+    return header + np.asarray(readings + wavelengths, dtype="<f4").tobytes()
+
+
+def test_decode_spectral_frame():
+    timestamp = datetime(2025, 1, 15, 10, 30, 0, 250000)
+    decoded_at, readings, wavelengths = decode_spectral_frame(_frame(timestamp, [10.5, 99.0], [400.0, 800.0]))
+
+    assert decoded_at == timestamp
+    assert readings.dtype == np.float32
+    np.testing.assert_array_equal(readings, [10.5, 99.0])
+    np.testing.assert_array_equal(wavelengths, [400.0, 800.0])
+
+
+def test_decode_empty_spectral_frame():
+    _, readings, wavelengths = decode_spectral_frame(_frame(datetime(2025, 1, 15), [], []))
+    assert len(readings) == 0
+    assert len(wavelengths) == 0
+
+
+def test_decode_rejects_truncated_header():
+    with pytest.raises(ValueError, match="shorter than its header"):
+        decode_spectral_frame(b"\x00" * (SPECTRAL_FRAME_HEADER.size - 1))
+
+
+@pytest.mark.parametrize("extra", [-4, 4])
+def test_decode_rejects_length_mismatch(extra):
+    frame = _frame(datetime(2025, 1, 15), [1.0, 2.0], [400.0, 500.0])
+    body = frame[:extra] if extra < 0 else frame + b"\x00" * extra
+    with pytest.raises(ValueError, match="expected"):
+        decode_spectral_frame(body)
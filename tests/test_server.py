@@ -0,0 +1,28 @@
+"""Tests for the monitoring API application."""
+
+from __future__ import annotations
+
+import httpx
+
+from monitoring.device_registry import DeviceRegistry
+from monitoring.server import create_app
+
+
+async def test_health_check():
+    app = create_app(DeviceRegistry())
+    async with httpx.AsyncClient(transport=httpx.ASGITransport(app=app), base_url="http://test") as client:
+        response = await client.get("/health")
+
+    assert response.status_code == 200
+    assert response.json() == {"status": "ok"}
+    assert "/health" in app.openapi()["paths"]
+
+
+async def test_health_probe():
+    app = create_app(DeviceRegistry())
+    async with httpx.AsyncClient(transport=httpx.ASGITransport(app=app), base_url="http://test") as client:
+        response = await client.head("/health")
+
+    assert response.status_code == 200
+    assert response.content == b""
+    assert set(app.openapi()["paths"]["/health"]) == {"get", "head"}
@@ -0,0 +1,77 @@
+"""Tests for the spectrometer endpoints of the monitoring API."""
+
+from __future__ import annotations
+
+import httpx
+import pytest
+
+from monitoring.device_registry import DeviceRegistry
+from monitoring.models import SpectrometerConfig
+from monitoring.server import create_app
+
+SPECTRUM = {
+    "calibrated_readings": [10.5, 25.3, 45.8],
+    "wavelengths": [400.0, 500.0, 600.0],
+    "timestamp": "2025-01-15T10:30:00",
+}
+
+
+@pytest.fixture
+def registry() -> DeviceRegistry:
+    return DeviceRegistry()
+
+
+@pytest.fixture
+async def api(registry):
+    transport = httpx.ASGITransport(app=create_app(registry))
+    async with httpx.AsyncClient(transport=transport, base_url="http://test") as client:
+        yield client
+
+
+@pytest.fixture
+def spectrometer(registry) -> SpectrometerConfig:
+    return registry.add_spectrometer(SpectrometerConfig(device_id="dev", name="Spectro"))
+
+
+async def test_get_data_without_spectrum(api, spectrometer):
+    response = await api.get(f"/spectrometers/{spectrometer.id}/data")
+
+    assert response.status_code == 200
+    assert response.json() is None
+    assert "etag" not in response.headers
+
+
+async def test_get_data_sends_etag(api, spectrometer):
+    await api.post(f"/spectrometers/{spectrometer.id}/data", json=SPECTRUM)
+    response = await api.get(f"/spectrometers/{spectrometer.id}/data")
+
+    assert response.status_code == 200
+    assert response.json()["calibrated_readings"] == SPECTRUM["calibrated_readings"]
+    assert response.headers["etag"].startswith('"')
+    assert response.headers["cache-control"] == "no-cache"
+
+
+@pytest.mark.parametrize("if_none_match", ["{etag}", "W/{etag}", '"other", {etag}', "*"])
+async def test_get_data_revalidates_to_304(api, spectrometer, if_none_match):
+    await api.post(f"/spectrometers/{spectrometer.id}/data", json=SPECTRUM)
+    etag = (await api.get(f"/spectrometers/{spectrometer.id}/data")).headers["etag"]
+
+    response = await api.get(
+        f"/spectrometers/{spectrometer.id}/data", headers={"If-None-Match": if_none_match.format(etag=etag)}
+    )
+
+    assert response.status_code == 304
+    assert response.content == b""
+    assert response.headers["etag"] == etag
+
+
+async def test_get_data_returns_new_spectrum_for_stale_etag(api, spectrometer):
+    await api.post(f"/spectrometers/{spectrometer.id}/data", json=SPECTRUM)
+    etag = (await api.get(f"/spectrometers/{spectrometer.id}/data")).headers["etag"]
+
+    await api.post(f"/spectrometers/{spectrometer.id}/data", json={**SPECTRUM, "calibrated_readings": [1.0, 2.0, 3.0]})
+    response = await api.get(f"/spectrometers/{spectrometer.id}/data", headers={"If-None-Match": etag})
+
+    assert response.status_code == 200
+    assert response.json()["calibrated_readings"] == [1.0, 2.0, 3.0]
+    assert response.headers["etag"] != etag
@@ -0,0 +1,94 @@
+"""Tests for the virtual spectrometer device service."""
+
+from __future__ import annotations
+
+import time
+from types import SimpleNamespace
+
+import httpx
+import numpy as np
+import orjson
+import pytest
+
+import virtual_spectrometer
+from virtual_spectrometer import VirtualSpectrometer, create_app
+
+
+@pytest.fixture
+async def device():
+    spectrometer = VirtualSpectrometer(num_points=16)
+    transport = httpx.ASGITransport(app=create_app(spectrometer))
+    async with httpx.AsyncClient(transport=transport, base_url="http://test") as client:
+        yield client
+
+
+async def test_set_material(device):
+    response = await device.post("/vacuum_chamber/material", json={"material": "L", "fraction": 42.5})
+
+    assert response.status_code == 200
+    assert response.json() == {"material": "L", "fraction": 42.5}
+    assert (await device.get("/vacuum_chamber/material")).json() == {"material": "L", "fraction": 42.5}
+
+
+async def test_set_material_defaults(device):
+    response = await device.post("/vacuum_chamber/material", json={})
+
+    assert response.status_code == 200
+    assert response.json() == {"material": "H", "fraction": 100.0}
+
+
+@pytest.mark.parametrize("body", [{"material": None}, {"fraction": "most"}])
+async def test_set_material_rejects_invalid_body(device, body):
+    response = await device.post("/vacuum_chamber/material", json=body)
+
+    assert response.status_code == 422
+    assert (await device.get("/vacuum_chamber/material")).json() == {"material": "H", "fraction": 100.0}
+
+
+@pytest.mark.parametrize("num_points", [16, VirtualSpectrometer.STREAM_CHUNK_POINTS * 2 + 5])
+async def test_get_data_body_is_the_same_streamed_or_not(num_points):
+    spectrometer = VirtualSpectrometer(num_points=num_points)
+    readings = np.linspace(0.0, 100.0, num_points)
+    spectrometer.generate_spectral_data = lambda: readings
+
+    transport = httpx.ASGITransport(app=create_app(spectrometer))
+    async with httpx.AsyncClient(transport=transport, base_url="http://test") as client:
+        response = await client.get("/data")
+
+    assert response.status_code == 200
+    streamed = num_points > spectrometer.STREAM_CHUNK_POINTS
+    assert ("content-length" not in response.headers) is streamed
+
+    body = orjson.loads(response.content)
+    expected = orjson.loads(spectrometer.spectral_payload(readings))
+    assert body.pop("timestamp")
+    expected.pop("timestamp")
+    assert body == expected
+    assert len(body["calibrated_readings"]) == len(body["wavelengths"]) == num_points
+
+
+async def test_generation_keeps_cadence_and_skips_missed_ticks(monkeypatch):
+    spectrometer = VirtualSpectrometer(num_points=16, update_interval=0.5)
+    clock = [0.0]
+    generation_costs = iter([0.1, 0.1, 1.3, 0.1])
+    sleeps: list[float] = []
+    generate = spectrometer.generate_spectral_data
+
+    def slow_generate():
+        clock[0] += next(generation_costs)
+        return generate()
+
+    async def fake_sleep(delay):
+        sleeps.append(round(delay, 6))
+        clock[0] += delay
+        if len(sleeps) == 4:
+            spectrometer.is_running = False
+
+    spectrometer.generate_spectral_data = slow_generate
+    monkeypatch.setattr(virtual_spectrometer, "time", SimpleNamespace(monotonic=lambda: clock[0], time=time.time))
+    monkeypatch.setattr(virtual_spectrometer.asyncio, "sleep", fake_sleep)
+    spectrometer.is_running = True
+    await spectrometer.data_generation_loop()
+
+    # Generation time is taken out of the interval; after the overrun the schedule restarts without a burst
+    assert sleeps == [0.4, 0.4, 0.0, 0.4]
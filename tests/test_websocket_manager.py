@@ -0,0 +1,112 @@
+"""Tests for WebSocket fan-out of spectral data."""
+
+from __future__ import annotations
+
+import asyncio
+from datetime import datetime
+
+import orjson
+
+from monitoring.websocket_manager import WebSocketManager
+
+
+class FakeWebSocket:
+    """Records sent frames; sends block until `release` is set."""
+
+    def __init__(self):
+        self.sent: list[dict] = []
+        self.closed_with: int | None = None
+        self.release = asyncio.Event()
+        self.release.set()
+
+    async def accept(self):
+        pass
+
+    async def send(self, message: dict):
+        await self.release.wait()
+        self.sent.append(message)
+
+    async def close(self, code: int = 1000):
+        self.closed_with = code
+
+
+async def _broadcast(manager: WebSocketManager, spectrometer_id: str):
+    await manager.broadcast_spectral_data(spectrometer_id, datetime(2025, 1, 15), [1.0, 2.0])
+
+
+async def wait_until(condition, timeout: float = 1.0):
+    async with asyncio.timeout(timeout):
+        while not condition():
+            await asyncio.sleep(0.001)
+
+
+async def test_broadcast_reaches_every_client():
+    manager = WebSocketManager()
+    clients = [FakeWebSocket(), FakeWebSocket()]
+    for ws in clients:
+        assert await manager.connect(ws)
+
+    await _broadcast(manager, "spec")
+    await wait_until(lambda: all(ws.sent for ws in clients))
+
+    for ws in clients:
+        message = orjson.loads(ws.sent[0]["text"])
+        assert message == {
+            "spectrometer_id": "spec",
+            "timestamp": "2025-01-15T00:00:00",
+            "calibrated_readings": [1.0, 2.0],
+        }
+        manager.disconnect(ws)
+
+
+async def test_lagging_client_drops_oldest_frames():
+    manager = WebSocketManager()
+    ws = FakeWebSocket()
+    ws.release.clear()
+    await manager.connect(ws)
+
+    # The sender takes frame 0 and blocks on it; the queue then overflows by two
+    await _broadcast(manager, "spec-0")
+    await asyncio.sleep(0)
+    for i in range(1, manager.SEND_QUEUE_SIZE + 3):
+        await _broadcast(manager, f"spec-{i}")
+
+    ws.release.set()
+    await wait_until(lambda: len(ws.sent) == manager.SEND_QUEUE_SIZE + 1)
+    received = [orjson.loads(frame["text"])["spectrometer_id"] for frame in ws.sent]
+    assert received == ["spec-0"] + [f"spec-{i}" for i in range(3, manager.SEND_QUEUE_SIZE + 3)]
+    manager.disconnect(ws)
+
+
+async def test_stalled_client_is_disconnected():
+    manager = WebSocketManager()
+    manager.SEND_TIMEOUT = 0.01
+    stalled, healthy = FakeWebSocket(), FakeWebSocket()
+    stalled.release.clear()
+    await manager.connect(stalled)
+    await manager.connect(healthy)
+
+    await _broadcast(manager, "spec")
+    await wait_until(lambda: stalled.closed_with is not None)
+
+    assert manager.active_connections == (healthy,)
+    assert len(healthy.sent) == 1
+    manager.disconnect(healthy)
+
+
+async def test_connections_beyond_limit_are_rejected():
+    manager = WebSocketManager()
+    manager.MAX_CONNECTIONS = 2
+    first, second, third = FakeWebSocket(), FakeWebSocket(), FakeWebSocket()
+
+    assert await manager.connect(first)
+    assert await manager.connect(second)
+    assert not await manager.connect(third)
+    assert third.closed_with == 1013
+    assert manager.active_connections == (first, second)
+
+    manager.disconnect(first)
+    assert await manager.connect(third)
+    assert manager.active_connections == (second, third)
+    manager.disconnect(second)
+    manager.disconnect(third)
@@ -1,18 +1,27 @@
 import argparse
 import asyncio
 import logging
+import math
+import struct
+import time
+from contextlib import asynccontextmanager
 from datetime import datetime
 from typing import Optional
 
 import httpx
 import numpy as np
+import orjson
 import uvicorn
-from fastapi import Body, FastAPI
+from fastapi import FastAPI, Response
+from fastapi.responses import StreamingResponse
 from pydantic import BaseModel
 
 logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
 
+# Binary spectral frame header for POST .../data/binary: uint64 timestamp (us since epoch), uint32 N
+SPECTRAL_FRAME_HEADER = struct.Struct("<QI")
+
 
 class DeviceInfo(BaseModel):
     type: str
@@ -35,7 +44,60 @@ class RegisterRequest(BaseModel):
     monitoring_api_url: str
 
 
+class MaterialRequest(BaseModel):
+    material: str = "H"
+    fraction: float = 100.0
+
+
+class RegisterResponse(BaseModel):
+    status: str
+    spectrometer_id: str | None
+    vacuum_chamber_id: str | None
+    monitoring_api_url: str
+
+
+class ControlWavelengthResponse(BaseModel):
+    control_wavelength: float
+
+
+class RunningResponse(BaseModel):
+    running: bool
+
+
+class StatusResponse(BaseModel):
+    running: bool
+    control_wavelength: float
+    name: str
+
+
+class SpectralDataResponse(BaseModel):
+    calibrated_readings: list[float]
+    wavelengths: list[float]
+    timestamp: datetime
+
+
+class VacuumChamberStateResponse(BaseModel):
+    status: str
+
+
+class VacuumChamberStatusResponse(BaseModel):
+    status: str
+    is_depositing: bool
+
+
+class MaterialResponse(BaseModel):
+    material: str
+    fraction: float
+
+
 class VirtualSpectrometer:
+    # Size of the precomputed noise pool, in multiples of num_points
+    NOISE_POOL_FACTOR = 16
+    # Samples waiting to be posted; beyond this the oldest is dropped
+    POST_QUEUE_SIZE = 32
+    # GET /data streams spectra longer than this, encoding this many readings per chunk
+    STREAM_CHUNK_POINTS = 65536
+
     def __init__(
         self,
         name: str = "Virtual Spectrometer",
@@ -48,6 +110,7 @@ class VirtualSpectrometer:
         device_type: str = "two-component",
         has_spectrometer: bool = True,
         has_vacuum_chamber: bool = True,
+        binary_frames: bool = False,
     ):
         self.name = name
         self.num_points = num_points
@@ -59,55 +122,173 @@ class VirtualSpectrometer:
         self.device_type = device_type
         self.has_spectrometer = has_spectrometer
         self.has_vacuum_chamber = has_vacuum_chamber
+        self.binary_frames = binary_frames
         self.control_wavelength = 550.0
         self.is_running = False
         self.data_task: Optional[asyncio.Task] = None
+        self.post_task: Optional[asyncio.Task] = None
+        self._post_queue: asyncio.Queue[tuple[str, bytes, str]] = asyncio.Queue(maxsize=self.POST_QUEUE_SIZE)
+        self._client: Optional[httpx.AsyncClient] = None
+        self._device_info_cache: tuple[tuple, bytes] | None = None
         self.time_offset = 0.0
         self.current_material = "H"
         self.current_fraction = 100.0
-        self.wavelength = np.linspace(400.0, 900.0, num_points).tolist()
+        self.wavelength = np.linspace(400.0, 900.0, num_points)
+        # sin(x + t) = sin(x)cos(t) + cos(x)sin(t): the x terms (with the 30.0 amplitude folded in)
+        # are fixed, so a tick only scales and sums them. Output and scratch buffers are allocated once.
+        phase = np.linspace(0, 2 * np.pi, num_points)
+        self._sin_phase = np.sin(phase) * 30.0
+        self._cos_phase = np.cos(phase) * 30.0
+        self._readings = np.empty(num_points)
+        self._scratch = np.empty(num_points)
+        # Noise is drawn once; each tick reads a window from a random offset into the pool
+        self._rng = np.random.default_rng()
+        self._noise_pool = self._rng.normal(0, 2.0, num_points * self.NOISE_POOL_FACTOR)
+        # The wavelength grid never changes, so its JSON is built once and spliced into every payload
+        self._wavelength_json = orjson.dumps(self.wavelength, option=orjson.OPT_SERIALIZE_NUMPY)
+        self._wavelength_frame = self.wavelength.astype("<f4").tobytes()
+
+    @property
+    def client(self) -> httpx.AsyncClient:
+        """HTTP client for calls to the monitoring API, kept open across start/stop cycles."""
+        if self._client is None:
+            # Posts are sent one at a time, so a small pool suffices. A refused connect fails fast
+            # instead of holding the queue for the full timeout. The keep-alive expiry stays at
+            # httpx's 5s default, matching uvicorn's idle timeout on the monitoring side.
+            self._client = httpx.AsyncClient(
+                timeout=httpx.Timeout(5.0, connect=2.0),
+                limits=httpx.Limits(max_connections=4, max_keepalive_connections=4),
+            )
+        return self._client
+
+    async def aclose(self):
+        """Stop acquisition if running and close the HTTP client."""
+        if self.is_running:
+            await self.stop()
+        if self._client is not None:
+            await self._client.aclose()
+            self._client = None
+
+    def device_info_json(self) -> bytes:
+        """Serialized DeviceInfo, rebuilt only when a field it reports has changed."""
+        key = (self.name, self.has_spectrometer, self.has_vacuum_chamber, self.device_type, self.is_monochromatic)
+        if self._device_info_cache is None or self._device_info_cache[0] != key:
+            capabilities = {
+                "has_spectrometer": self.has_spectrometer,
+                "has_vacuum_chamber": self.has_vacuum_chamber,
+            }
+            if self.has_spectrometer:
+                capabilities["process_type"] = self.device_type
+                capabilities["is_monochromatic"] = self.is_monochromatic
+            info = DeviceInfo(type="spectrometer", name=self.name, capabilities=capabilities)
+            self._device_info_cache = (key, info.model_dump_json().encode())
+        return self._device_info_cache[1]
 
     def generate_spectral_data(self) -> np.ndarray:
-        x = np.linspace(0, 2 * np.pi, self.num_points)
-        sine_wave = np.sin(x + self.time_offset) * 30.0 + 50.0
-        noise = np.random.normal(0, 2.0, self.num_points)
-        calibrated_readings = sine_wave + noise
-        calibrated_readings = np.clip(calibrated_readings, 0, 100)
-        return calibrated_readings
+        """Compute the next spectrum in place.
+
+        The returned array is overwritten by the next call; serialize or copy it before then.
+        """
+        readings = self._readings
+        np.multiply(self._sin_phase, math.cos(self.time_offset), out=readings)
+        np.multiply(self._cos_phase, math.sin(self.time_offset), out=self._scratch)
+        readings += self._scratch
+        readings += 50.0
+        start = self._rng.integers(len(self._noise_pool) - self.num_points + 1)
+        readings += self._noise_pool[start : start + self.num_points]
+        # Two in-place ufuncs are cheaper than np.clip's dispatch for arrays this size
+        np.minimum(readings, 100.0, out=readings)
+        np.maximum(readings, 0.0, out=readings)
+        return readings
+
+    def spectral_payload(self, calibrated_readings: np.ndarray) -> bytes:
+        """JSON body for a spectrum: readings, the cached wavelength grid and the current time."""
+        return b"".join(
+            (
+                b'{"calibrated_readings":',
+                orjson.dumps(calibrated_readings, option=orjson.OPT_SERIALIZE_NUMPY),
+                b',"wavelengths":',
+                self._wavelength_json,
+                b',"timestamp":',
+                orjson.dumps(datetime.now()),
+                b"}",
+            )
+        )
+
+    async def iter_spectral_payload(self, calibrated_readings: np.ndarray):
+        """Same JSON as spectral_payload, encoded STREAM_CHUNK_POINTS readings at a time.
+
+        The caller must pass an array that is not reused while the response is being sent.
+        """
+        timestamp = orjson.dumps(datetime.now())
+        yield b'{"calibrated_readings":['
+        for start in range(0, len(calibrated_readings), self.STREAM_CHUNK_POINTS):
+            if start:
+                # Let other tasks run between chunks even if sending the previous one did not suspend
+                await asyncio.sleep(0)
+            chunk = calibrated_readings[start : start + self.STREAM_CHUNK_POINTS]
+            encoded = orjson.dumps(chunk, option=orjson.OPT_SERIALIZE_NUMPY)[1:-1]
+            yield b"," + encoded if start else encoded
+        yield b"".join((b'],"wavelengths":', self._wavelength_json, b',"timestamp":', timestamp, b"}"))
+
+    def spectral_frame(self, calibrated_readings: np.ndarray) -> bytes:
+        """Binary frame for a spectrum: header, float32 readings, then the cached float32 wavelength grid."""
+        header = SPECTRAL_FRAME_HEADER.pack(int(time.time() * 1_000_000), len(calibrated_readings))
+        return b"".join((header, calibrated_readings.astype("<f4").tobytes(), self._wavelength_frame))
 
     async def data_generation_loop(self):
         logger.info(f"Starting data generation loop (interval: {self.update_interval}s)")
-        async with httpx.AsyncClient() as client:
-            while self.is_running:
-                try:
-                    calibrated_readings = self.generate_spectral_data()
-                    self.time_offset += 0.1
-
-                    if self.monitoring_api_url and self.spectrometer_id:
-                        url = f"{self.monitoring_api_url}/spectrometers/{self.spectrometer_id}/data"
-                        payload = {
-                            "calibrated_readings": calibrated_readings.tolist(),
-                            "wavelengths": self.wavelength,
-                            "timestamp": datetime.now().isoformat(),
-                        }
-
-                        try:
-                            response = await client.post(url, json=payload, timeout=5.0)
-                            if response.status_code == 200:
-                                logger.debug(f"Posted data to {url}")
-                            else:
-                                logger.warning(f"Failed to post data: {response.status_code}")
-                        except Exception as e:
-                            logger.error(f"Error posting data: {e}")
-
-                    await asyncio.sleep(self.update_interval)
-
-                except asyncio.CancelledError:
-                    logger.info("Data generation loop cancelled")
-                    break
-                except Exception as e:
-                    logger.error(f"Error in data generation loop: {e}")
-                    await asyncio.sleep(self.update_interval)
+        next_tick = time.monotonic()
+        while self.is_running:
+            try:
+                calibrated_readings = self.generate_spectral_data()
+                self.time_offset += 0.1
+
+                if self.monitoring_api_url and self.spectrometer_id:
+                    url = f"{self.monitoring_api_url}/spectrometers/{self.spectrometer_id}/data"
+                    # Serialized now: the readings buffer is reused next tick and the timestamp is the sample's
+                    if self.binary_frames:
+                        self._enqueue_post(
+                            f"{url}/binary", self.spectral_frame(calibrated_readings), "application/octet-stream"
+                        )
+                    else:
+                        self._enqueue_post(url, self.spectral_payload(calibrated_readings), "application/json")
+            except Exception as e:
+                logger.error(f"Error in data generation loop: {e}")
+
+            # Ticks follow an absolute schedule so time spent generating does not add up as drift.
+            # After falling behind (e.g. a blocked loop) the schedule restarts from now: missed ticks
+            # are skipped rather than generated in a burst.
+            next_tick += self.update_interval
+            now = time.monotonic()
+            if next_tick < now:
+                next_tick = now
+            try:
+                await asyncio.sleep(next_tick - now)
+            except asyncio.CancelledError:
+                logger.info("Data generation loop cancelled")
+                break
+
+    def _enqueue_post(self, url: str, payload: bytes, content_type: str):
+        if self._post_queue.full():
+            # The monitoring API is lagging; drop the oldest sample rather than stall generation
+            self._post_queue.get_nowait()
+            logger.warning("Post queue full, dropping oldest sample")
+        self._post_queue.put_nowait((url, payload, content_type))
+
+    async def posting_loop(self):
+        """Send queued samples to the monitoring API, so a slow POST never delays the next tick."""
+        client = self.client
+        while True:
+            url, payload, content_type = await self._post_queue.get()
+            try:
+                response = await client.post(url, content=payload, headers={"content-type": content_type})
+                if response.status_code == 200:
+                    logger.debug(f"Posted data to {url}")
+                else:
+                    logger.warning(f"Failed to post data: {response.status_code}")
+            except Exception as e:
+                logger.error(f"Error posting data: {e}")
 
     async def start(self):
         if self.is_running:
@@ -115,7 +296,9 @@ class VirtualSpectrometer:
             return
 
         self.is_running = True
+        self._post_queue = asyncio.Queue(maxsize=self.POST_QUEUE_SIZE)
         self.data_task = asyncio.create_task(self.data_generation_loop())
+        self.post_task = asyncio.create_task(self.posting_loop())
         logger.info("Virtual spectrometer started")
 
     async def stop(self):
@@ -124,35 +307,31 @@ class VirtualSpectrometer:
             return
 
         self.is_running = False
-        if self.data_task:
-            self.data_task.cancel()
-            try:
-                await self.data_task
-            except asyncio.CancelledError:
-                pass
+        for task in (self.data_task, self.post_task):
+            if task:
+                task.cancel()
+                try:
+                    await task
+                except asyncio.CancelledError:
+                    pass
         logger.info("Virtual spectrometer stopped")
 
 
 def create_app(spectrometer: VirtualSpectrometer) -> FastAPI:
-    app = FastAPI(title="Virtual Spectrometer with Vacuum Chamber", version="1.0.0")
+    @asynccontextmanager
+    async def lifespan(app: FastAPI):
+        try:
+            yield
+        finally:
+            await spectrometer.aclose()
+
+    app = FastAPI(title="Virtual Spectrometer with Vacuum Chamber", version="1.0.0", lifespan=lifespan)
 
     @app.get("/device/info", response_model=DeviceInfo)
     async def get_device_info():
-        capabilities = {
-            "has_spectrometer": spectrometer.has_spectrometer,
-            "has_vacuum_chamber": spectrometer.has_vacuum_chamber,
-        }
-        if spectrometer.has_spectrometer:
-            capabilities["process_type"] = spectrometer.device_type
-            capabilities["is_monochromatic"] = spectrometer.is_monochromatic
-        return DeviceInfo(
-            type="spectrometer",
-            name=spectrometer.name,
-            device_type=None,
-            capabilities=capabilities,
-        )
+        return Response(content=spectrometer.device_info_json(), media_type="application/json")
 
-    @app.post("/register")
+    @app.post("/register", response_model=RegisterResponse)
     async def register(request: RegisterRequest):
         spectrometer.monitoring_api_url = request.monitoring_api_url
         if request.spectrometer_id:
@@ -169,27 +348,27 @@ def create_app(spectrometer: VirtualSpectrometer) -> FastAPI:
             "monitoring_api_url": spectrometer.monitoring_api_url,
         }
 
-    @app.post("/control_wavelength")
+    @app.post("/control_wavelength", response_model=ControlWavelengthResponse)
     async def set_control_wavelength(request: ControlWavelengthRequest):
         spectrometer.control_wavelength = request.wavelength
         logger.info(f"Control wavelength set to {request.wavelength} nm")
         return {"control_wavelength": spectrometer.control_wavelength}
 
-    @app.get("/control_wavelength")
+    @app.get("/control_wavelength", response_model=ControlWavelengthResponse)
     async def get_control_wavelength():
         return {"control_wavelength": spectrometer.control_wavelength}
 
-    @app.post("/start")
+    @app.post("/start", response_model=RunningResponse)
     async def start_acquisition():
         await spectrometer.start()
         return {"running": spectrometer.is_running}
 
-    @app.post("/stop")
+    @app.post("/stop", response_model=RunningResponse)
     async def stop_acquisition():
         await spectrometer.stop()
         return {"running": spectrometer.is_running}
 
-    @app.get("/status")
+    @app.get("/status", response_model=StatusResponse)
     async def get_status():
         return {
             "running": spectrometer.is_running,
@@ -197,42 +376,44 @@ def create_app(spectrometer: VirtualSpectrometer) -> FastAPI:
             "name": spectrometer.name,
         }
 
-    @app.get("/data")
+    @app.get("/data", response_model=SpectralDataResponse)
     async def get_data():
         calibrated_readings = spectrometer.generate_spectral_data()
-        return {
-            "timestamp": datetime.now().isoformat(),
-            "calibrated_readings": calibrated_readings.tolist(),
-            "wavelengths": spectrometer.wavelength,
-        }
-
-    @app.post("/vacuum_chamber/start")
+        if len(calibrated_readings) > spectrometer.STREAM_CHUNK_POINTS:
+            # Large spectra are encoded while being sent instead of blocking the loop on one dumps() call;
+            # the copy keeps the next tick from overwriting readings mid-response
+            return StreamingResponse(
+                spectrometer.iter_spectral_payload(calibrated_readings.copy()), media_type="application/json"
+            )
+        return Response(content=spectrometer.spectral_payload(calibrated_readings), media_type="application/json")
+
+    @app.post("/vacuum_chamber/start", response_model=VacuumChamberStateResponse)
     async def start_vacuum_chamber():
         await spectrometer.start()
         logger.info("Vacuum chamber started - beginning deposition")
         return {"status": "running"}
 
-    @app.post("/vacuum_chamber/stop")
+    @app.post("/vacuum_chamber/stop", response_model=VacuumChamberStateResponse)
     async def stop_vacuum_chamber():
         await spectrometer.stop()
         logger.info("Vacuum chamber stopped - deposition ended")
         return {"status": "stopped"}
 
-    @app.get("/vacuum_chamber/status")
+    @app.get("/vacuum_chamber/status", response_model=VacuumChamberStatusResponse)
     async def get_vacuum_chamber_status():
         return {
             "status": "running" if spectrometer.is_running else "stopped",
             "is_depositing": spectrometer.is_running,
         }
 
-    @app.get("/vacuum_chamber/material")
+    @app.get("/vacuum_chamber/material", response_model=MaterialResponse)
     async def get_vacuum_chamber_material():
         return {"material": spectrometer.current_material, "fraction": spectrometer.current_fraction}
 
-    @app.post("/vacuum_chamber/material")
-    async def set_vacuum_chamber_material(payload: dict = Body(...)):
-        spectrometer.current_material = payload.get("material", "H")
-        spectrometer.current_fraction = payload.get("fraction", 100.0)
+    @app.post("/vacuum_chamber/material", response_model=MaterialResponse)
+    async def set_vacuum_chamber_material(request: MaterialRequest):
+        spectrometer.current_material = request.material
+        spectrometer.current_fraction = request.fraction
         logger.info(f"Material set to {spectrometer.current_material} with fraction {spectrometer.current_fraction}%")
         return {"material": spectrometer.current_material, "fraction": spectrometer.current_fraction}
 
@@ -249,6 +430,9 @@ def main():
     parser.add_argument("--spectrometer-id", type=str, help="Spectrometer ID in monitoring system")
     parser.add_argument("--vacuum-chamber-id", type=str, help="Vacuum chamber ID in monitoring system")
     parser.add_argument("--device-type", type=str, default="two-component", help="Spectrometer type")
+    parser.add_argument(
+        "--binary-frames", action="store_true", help="Post spectra as binary float32 frames instead of JSON"
+    )
 
     args = parser.parse_args()
 
@@ -262,6 +446,7 @@ def main():
         device_type=args.device_type,
         has_spectrometer=True,
         has_vacuum_chamber=True,
+        binary_frames=args.binary_frames,
     )
 
     app = create_app(spectrometer)